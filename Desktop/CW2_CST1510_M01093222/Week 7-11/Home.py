@@ -8,6 +8,9 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+from app.data.bootstrap import bootstrap
+from app.services.bcrypt_cost import calibrate_in_background
+
 # Page configuration
 st.set_page_config(
     page_title="Intelligence Platform",
@@ -21,11 +24,9 @@ if 'username' not in st.session_state:
     st.session_state.username = ""
 if 'role' not in st.session_state:
     st.session_state.role = "user"
-if 'users' not in st.session_state:
-    st.session_state.users = {}
 
 def show_login_form():
-    """Login form from tutorial"""
+    """Login form: one bcrypt check, then a session token for every later page"""
     st.subheader("Login")
     
     login_username = st.text_input("Username", key="login_username")
@@ -34,20 +35,19 @@ def show_login_form():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("Log in", key="login_button", use_container_width=True):
-            if login_username in st.session_state.users:
-                if st.session_state.users[login_username] == login_password:
-                    st.session_state.logged_in = True
-                    st.session_state.username = login_username
-                    st.session_state.role = "USER"
-                    st.success(f"Login successful! Welcome, {login_username}")
-                    st.switch_page("pages/1_Dashboard.py")
-                else:
-                    st.error("Invalid credentials")
+            # Loaded on submit, so the form paints without the data layer
+            from app.services.user_service import login_user
+            from app.ui.auth import start_session, client_address
+
+            success, message = login_user(login_username, login_password, client=client_address())
+            if success and start_session(login_username):
+                st.success(message)
+                st.switch_page("pages/1_Dashboard.py")
             else:
-                st.error("User not found")
+                st.error(message)
 
 def show_register_form():
-    """Registration form from tutorial"""
+    """Registration form: accounts are stored in the users table"""
     st.subheader("Register")
     
     new_username = st.text_input("Choose a username", key="register_username")
@@ -61,14 +61,23 @@ def show_register_form():
                 st.warning("Please fill in all fields.")
             elif new_password != confirm_password:
                 st.error("Passwords do not match.")
-            elif new_username in st.session_state.users:
-                st.error("Username already exists.")
             else:
-                st.session_state.users[new_username] = new_password
-                st.success("Account created! ")
-                st.info("Go to Login tab to sign in.")
+                from app.services.user_service import register_user
+
+                success, message = register_user(new_username, new_password)
+                if success:
+                    st.success("Account created! ")
+                    st.info("Go to Login tab to sign in.")
+                else:
+                    st.error(message)
 
 def main():
+    # Schema + CSV seeding, once per server process
+    bootstrap()
+    # bcrypt cost for this machine, measured once per server process off the
+    # render thread; the first login or registration waits for it if needed
+    calibrate_in_background()
+    
     st.title("🛡️ Multi-Domain Intelligence Platform")
     st.divider()
     
@@ -7,23 +7,37 @@ import os
 from pathlib import Path
 import sys
 
-# Try to import dotenv
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    print("python-dotenv is not installed. Install it with: pip install python-dotenv")
-    sys.exit(1)
-
 # Load .env file from project root
 PROJECT_ROOT = Path(__file__).parent.parent
 ENV_FILE = PROJECT_ROOT / ".env"
 ENV_LOCAL_FILE = PROJECT_ROOT / ".env.local"
 
-# Load local env file first (if exists), then override with .env
-if ENV_LOCAL_FILE.exists():
-    load_dotenv(ENV_LOCAL_FILE, override=True)
-if ENV_FILE.exists():
-    load_dotenv(ENV_FILE, override=False)
+_env_loaded = False
+
+
+def _load_env_files():
+    """Load the .env files on first use rather than at import time."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+
+    # No .env files: nothing to load, and no need to import dotenv at all
+    if not ENV_LOCAL_FILE.exists() and not ENV_FILE.exists():
+        return
+
+    # Try to import dotenv
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        print("python-dotenv is not installed. Install it with: pip install python-dotenv")
+        sys.exit(1)
+
+    # Load local env file first (if exists), then override with .env
+    if ENV_LOCAL_FILE.exists():
+        load_dotenv(ENV_LOCAL_FILE, override=True)
+    if ENV_FILE.exists():
+        load_dotenv(ENV_FILE, override=False)
 
 
 def get_env(key: str, default=None) -> str:
@@ -37,6 +51,7 @@ def get_env(key: str, default=None) -> str:
     Returns:
         Environment variable value or default
     """
+    _load_env_files()
     value = os.getenv(key, default)
     if value is None:
         raise ValueError(f"Environment variable '{key}' not found and no default provided")
@@ -54,4 +69,5 @@ def get_env_optional(key: str, default=None) -> str:
     Returns:
         Environment variable value or default
     """
+    _load_env_files()
     return os.getenv(key, default)
@@ -0,0 +1,216 @@
+"""
+Exact counts for the dashboards, computed in SQL.
+
+Each function does one GROUP BY round trip over the full table and folds
+the (few) result rows into plain dicts, e.g.
+
+    {"total": 1000, "severity": {"high": 250, ...}, "status": {"open": 300, ...}}
+
+Category values are lower-cased so "High" and "high" count together.
+Incident and ticket counts are summed from the rollup tables (one row per
+day x category x status bucket) once migration 3 has created them.
+
+`get_trend` buckets incidents or tickets per day, week or month in SQL,
+picking the finest granularity that keeps a chart within a point budget.
+"""
+
+from datetime import date, timedelta
+
+from app.data.db import pooled_connection
+from app.data.cache import cached_query
+from app.data.rollups import rollup_exists
+
+
+def _count_by(conn, table, columns, count="COUNT(*)"):
+    """Return {"total": n, column: {value: count}} for each column in `columns`.
+
+    `count` is the per-row weight, e.g. SUM(count) when `table` is a rollup.
+    """
+    # Rollups store NULL as ''; both read as 'unknown'
+    select = ", ".join(f"COALESCE(NULLIF(LOWER({col}), ''), 'unknown')" for col in columns)
+    group_by = ", ".join(str(i) for i in range(1, len(columns) + 1))
+    rows = conn.execute(
+        f"SELECT {select}, {count} FROM {table} GROUP BY {group_by}"
+    ).fetchall()
+
+    result = {"total": 0}
+    for col in columns:
+        result[col] = {}
+    for row in rows:
+        count = row[-1]
+        result["total"] += count
+        for col, value in zip(columns, row):
+            result[col][value] = result[col].get(value, 0) + count
+
+    # Largest buckets first, like value_counts()
+    for col in columns:
+        result[col] = dict(sorted(result[col].items(), key=lambda kv: kv[1], reverse=True))
+    return result
+
+
+def _with_conn(conn, table, columns, rollup=None):
+    def _query(conn):
+        if rollup is not None and rollup_exists(conn, rollup):
+            return _count_by(conn, rollup, columns, count="SUM(count)")
+        return _count_by(conn, table, columns)
+
+    if conn is not None:
+        return _query(conn)
+    with pooled_connection() as conn:
+        return _query(conn)
+
+
+@cached_query
+def get_incident_counts(conn=None):
+    """Incident totals by severity and by status."""
+    return _with_conn(conn, "cyber_incidents", ["severity", "status"], rollup="incident_rollup")
+
+
+@cached_query
+def get_ticket_counts(conn=None):
+    """IT ticket totals by priority and by status."""
+    return _with_conn(conn, "it_tickets", ["priority", "status"], rollup="ticket_rollup")
+
+
+@cached_query
+def get_dataset_counts(conn=None):
+    """Dataset totals by category and by source."""
+    return _with_conn(conn, "datasets_metadata", ["category", "source"])
+
+
+@cached_query
+def get_user_role_counts(conn=None):
+    """users_data totals by role."""
+    return _with_conn(conn, "users_data", ["role"])
+
+
+# kind -> (table, date column, rollup)
+TREND_SOURCES = {
+    "incidents": ("cyber_incidents", "date", "incident_rollup"),
+    "tickets": ("it_tickets", "created_date", "ticket_rollup"),
+}
+GRANULARITIES = ("day", "week", "month")
+DEFAULT_MAX_POINTS = 400
+
+# Period label (first day of the bucket) for a YYYY-MM-DD expression;
+# weeks start on Monday
+_PERIOD_SQL = {
+    "day": "{day}",
+    "week": "date({day}, '-6 days', 'weekday 1')",
+    "month": "substr({day}, 1, 7) || '-01'",
+}
+
+
+def _trend_source(conn, kind):
+    """(table, day expression, count expression) to read `kind` from."""
+    table, column, rollup = TREND_SOURCES[kind]
+    if rollup_exists(conn, rollup):
+        return rollup, "day", "SUM(count)"
+    return table, f"substr({column}, 1, 10)", "COUNT(*)"
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def choose_granularity(start, end, max_points=DEFAULT_MAX_POINTS):
+    """Finest granularity with at most `max_points` buckets between start and end.
+
+    Falls back to "month" when even months exceed the budget.
+    """
+    days = (_as_date(end) - _as_date(start)).days + 1
+    if days <= max_points:
+        return "day"
+    if days / 7 <= max_points:
+        return "week"
+    return "month"
+
+
+def _periods(start, end, granularity):
+    """Every period label from start to end, so empty buckets show as 0."""
+    if granularity == "day":
+        current = start
+    elif granularity == "week":
+        current = start - timedelta(days=start.weekday())
+    else:
+        current = start.replace(day=1)
+
+    while current <= end:
+        yield current.isoformat()
+        if granularity == "day":
+            current += timedelta(days=1)
+        elif granularity == "week":
+            current += timedelta(days=7)
+        elif current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            current = current.replace(month=current.month + 1)
+
+
+@cached_query
+def get_trend_range(kind, conn=None):
+    """(first, last) date of `kind` ("incidents" or "tickets") as date objects, or (None, None)."""
+    def _query(conn):
+        source, day, _ = _trend_source(conn, kind)
+        first, last = conn.execute(
+            f"SELECT MIN({day}), MAX({day}) FROM {source} WHERE date({day}) IS NOT NULL"
+        ).fetchone()
+        if first is None:
+            return None, None
+        return _as_date(first), _as_date(last)
+
+    if conn is not None:
+        return _query(conn)
+    with pooled_connection() as conn:
+        return _query(conn)
+
+
+@cached_query
+def get_trend(kind, start=None, end=None, granularity=None, max_points=DEFAULT_MAX_POINTS, conn=None):
+    """Counts of `kind` per period, bucketed in SQL.
+
+    Args:
+        kind: "incidents" or "tickets".
+        start, end: Inclusive date range (date or YYYY-MM-DD); defaults to
+            the first and last date in the data.
+        granularity: "day", "week" or "month"; chosen by
+            choose_granularity(start, end, max_points) when None.
+        max_points: Most points the chosen granularity may produce.
+        conn: Optional database connection.
+
+    Returns:
+        dict: {"granularity": g, "period": [YYYY-MM-DD, ...], "count": [n, ...]}
+        with one entry per period in the range (0 where nothing happened).
+    """
+    def _query(conn):
+        first, last = get_trend_range(kind, conn=conn)
+        range_start = _as_date(start) if start is not None else first
+        range_end = _as_date(end) if end is not None else last
+        if range_start is None or range_end is None or range_start > range_end:
+            return {"granularity": granularity or "day", "period": [], "count": []}
+
+        chosen = granularity or choose_granularity(range_start, range_end, max_points)
+        if chosen not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {chosen}")
+
+        source, day, count = _trend_source(conn, kind)
+        period = _PERIOD_SQL[chosen].format(day=day)
+        rows = conn.execute(
+            f"SELECT {period}, {count} FROM {source} "
+            f"WHERE {day} BETWEEN ? AND ? AND date({day}) IS NOT NULL "
+            f"GROUP BY 1",
+            (range_start.isoformat(), range_end.isoformat()),
+        ).fetchall()
+
+        counts = dict(rows)
+        periods = list(_periods(range_start, range_end, chosen))
+        return {
+            "granularity": chosen,
+            "period": periods,
+            "count": [counts.get(p, 0) for p in periods],
+        }
+
+    if conn is not None:
+        return _query(conn)
+    with pooled_connection() as conn:
+        return _query(conn)
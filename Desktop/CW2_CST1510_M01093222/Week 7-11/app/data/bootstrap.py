@@ -0,0 +1,131 @@
+"""
+One-time startup: create the schema and load the DATA/ CSV files.
+
+Each source file's size, mtime and SHA-256 are recorded in ingest_sources
+after it is loaded. On later starts a file whose size and mtime are
+unchanged is skipped without being read; if only the mtime moved (e.g. the
+file was copied) the hash decides. Within one process `bootstrap` does its
+work once; every later call returns immediately, so pages can call it on
+each render for free.
+"""
+
+import hashlib
+import threading
+
+from app.data.db import connect_database
+from app.data.schema import create_all_tables, create_users_data_table, create_ingest_sources_table
+from app.data.ingest import TABLE_SPECS, find_source_file, ingest_csv
+
+# table -> keyword of its file in DATA/
+SOURCES = {
+    "users_data": "users.txt",
+    "cyber_incidents": "cyber_incidents",
+    "it_tickets": "it_tickets",
+    "datasets_metadata": "datasets_metadata",
+}
+
+_lock = threading.Lock()
+_done = False
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _recorded(conn, table):
+    return conn.execute(
+        "SELECT path, size, mtime_ns, sha256, rows_written FROM ingest_sources WHERE table_name = ?", (table,)
+    ).fetchone()
+
+
+def _record(conn, table, path, size, mtime_ns, sha256, rows_written):
+    conn.execute(
+        "INSERT OR REPLACE INTO ingest_sources "
+        "(table_name, path, size, mtime_ns, sha256, rows_written) VALUES (?, ?, ?, ?, ?, ?)",
+        (table, str(path), size, mtime_ns, sha256, rows_written),
+    )
+    conn.commit()
+
+
+def sync_source(conn, table, keyword, progress=None):
+    """Load `table`'s source file if it changed since the last load.
+
+    Tables with an id column are appended to (existing ids are skipped);
+    raw copies without ids, like users_data, are replaced. A file seen for
+    the first time against a table that already has rows (a database from
+    before fingerprints were recorded) is only fingerprinted, so rows
+    deleted since the table was seeded do not come back.
+
+    Returns:
+        int: Rows written (0 when the file was unchanged or missing).
+    """
+    path = find_source_file(keyword)
+    if path is None:
+        return 0
+
+    stat = path.stat()
+    previous = _recorded(conn, table)
+    if previous is not None and previous[0] == str(path) and previous[1] == stat.st_size:
+        if previous[2] == stat.st_mtime_ns:
+            return 0
+        sha256 = file_sha256(path)
+        if sha256 == previous[3]:
+            _record(conn, table, path, stat.st_size, stat.st_mtime_ns, sha256, previous[4])
+            return 0
+    else:
+        sha256 = file_sha256(path)
+
+    if "id" not in TABLE_SPECS[table]["columns"]:
+        conn.execute(f"DELETE FROM {table}")
+        conn.commit()
+    elif previous is None and conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+        _record(conn, table, path, stat.st_size, stat.st_mtime_ns, sha256, 0)
+        return 0
+
+    written = ingest_csv(path, table, conn=conn, progress=progress).rows_written
+    _record(conn, table, path, stat.st_size, stat.st_mtime_ns, sha256, written)
+    return written
+
+
+def bootstrap(conn=None, force=False, progress=None):
+    """Create the schema and load changed source files, once per process.
+
+    Args:
+        conn: Database connection. If None, a bulk-ingest connection is used.
+        force: Run again even if this process already bootstrapped.
+        progress: Optional callback(IngestResult) passed to ingest_csv.
+
+    Returns:
+        dict: {table: rows written} for this call ({} if it was a no-op).
+    """
+    global _done
+    if _done and not force:
+        return {}
+
+    with _lock:
+        if _done and not force:
+            return {}
+
+        created_conn = False
+        if conn is None:
+            conn = connect_database(profile="bulk-ingest")
+            created_conn = True
+
+        try:
+            create_all_tables(conn)
+            create_users_data_table(conn)
+            create_ingest_sources_table(conn)
+
+            loaded = {}
+            for table, keyword in SOURCES.items():
+                loaded[table] = sync_source(conn, table, keyword, progress=progress)
+        finally:
+            if created_conn:
+                conn.close()
+
+        _done = True
+        return loaded
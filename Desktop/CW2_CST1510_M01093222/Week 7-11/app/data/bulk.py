@@ -0,0 +1,89 @@
+"""
+Bulk inserts: one transaction, executemany in fixed-size chunks.
+
+Used by the insert_*_bulk functions in incidents.py, tickets.py and
+datasets.py. Rows can be a DataFrame, dicts, or tuples in column order,
+and are streamed so an iterator/generator is never materialised whole.
+"""
+
+from collections import namedtuple
+from itertools import islice
+
+DEFAULT_CHUNK_SIZE = 5000
+
+BulkInsertResult = namedtuple("BulkInsertResult", ["inserted"])
+
+# No "replace": INSERT OR REPLACE deletes the old row without firing its
+# DELETE triggers (recursive_triggers is off), so the rollups and the
+# incident search index would drift from the base table.
+_CONFLICT_CLAUSES = {None: "INSERT", "ignore": "INSERT OR IGNORE"}
+
+
+def _iter_rows(rows, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield tuples in `columns` order from a DataFrame, dicts or tuples."""
+    if hasattr(rows, "itertuples"):  # pandas DataFrame
+        frame = rows.reindex(columns=columns)
+        # Convert a slice at a time: NaN -> None, numpy scalars -> Python
+        for start in range(0, len(frame), chunk_size):
+            part = frame.iloc[start:start + chunk_size].astype(object)
+            part = part.where(part.notna(), None)
+            yield from part.itertuples(index=False, name=None)
+        return
+    for row in rows:
+        if isinstance(row, dict):
+            yield tuple(row.get(col) for col in columns)
+        else:
+            yield tuple(row)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_insert(conn, table, columns, rows, chunk_size=DEFAULT_CHUNK_SIZE,
+                on_conflict=None, progress=None):
+    """Insert many rows into `table` inside a single transaction.
+
+    Args:
+        conn: Database connection.
+        table: Target table.
+        columns: Column names, in the order values are supplied.
+        rows: DataFrame, iterable of dicts, or iterable of tuples.
+        chunk_size: Rows handed to each executemany call.
+        on_conflict: None or "ignore" (skip rows that hit a unique constraint).
+        progress: Optional callback(rows_written) called after each chunk.
+
+    Returns:
+        BulkInsertResult(inserted): rows actually written, excluding any
+        skipped by on_conflict="ignore".
+    """
+    if on_conflict not in _CONFLICT_CLAUSES:
+        raise ValueError(f"Unsupported on_conflict: {on_conflict!r}")
+    sql = (f"{_CONFLICT_CLAUSES[on_conflict]} INTO {table} ({', '.join(columns)}) "
+           f"VALUES ({', '.join('?' for _ in columns)})")
+
+    # Join the caller's transaction if one is open, else own the whole write
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        inserted = 0
+        cursor = conn.cursor()
+        for chunk in _chunks(_iter_rows(rows, columns, chunk_size), chunk_size):
+            cursor.executemany(sql, chunk)
+            inserted += cursor.rowcount
+            if progress is not None:
+                progress(inserted)
+        if own_transaction:
+            conn.commit()
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+
+    return BulkInsertResult(inserted)
@@ -0,0 +1,174 @@
+"""
+Process-wide LRU cache for the read functions in app/data.
+
+Results are keyed on function + arguments and are only served while the
+database is unchanged. Freshness is checked with SQLite's
+`PRAGMA data_version` on a dedicated watcher connection: the value changes
+whenever any other connection (our pooled writers or another process)
+commits, so insert_incident, delete_incident, CSV loads etc. invalidate
+the cache immediately without having to call anything.
+
+Cached values are shared between sessions; callers must treat returned
+DataFrames and dicts as read-only.
+"""
+
+import functools
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+from app.config import get_env_optional
+from app.data.db import DB_PATH, _ensure_db_dir
+
+CACHE_MAX_BYTES = int(get_env_optional("QUERY_CACHE_MB", "64")) * 1024 * 1024
+CACHE_MAX_ENTRIES = 512
+
+
+def _estimate_size(value):
+    """Rough size in bytes of a cached result."""
+    if hasattr(value, "memory_usage"):  # pandas DataFrame / Series
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Turn dict/list arguments into something hashable for the cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class QueryCache:
+    """LRU of query results with a byte budget, invalidated on data_version."""
+
+    def __init__(self, db_path=DB_PATH, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._version = None
+        self._watcher = None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0,
+                       "invalidations": 0, "bypassed": 0}
+
+    def data_version(self):
+        """Current database version as seen by the watcher connection."""
+        with self._lock:
+            if self._watcher is None:
+                _ensure_db_dir(self.db_path)
+                self._watcher = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _drop_all(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def get(self, key):
+        """Return (True, value) on a fresh hit, else (False, version to store under)."""
+        version = self.data_version()
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._stats["invalidations"] += 1
+                self._drop_all()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, entry[0]
+            self._stats["misses"] += 1
+            return False, version
+
+    def put(self, key, value, version):
+        """Store a result computed while the database was at `version`."""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        # A write committed while we were querying: the result may be stale
+        if self.data_version() != version:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes
+                                     or len(self._entries) > self.max_entries):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def bypass(self):
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._drop_all()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["max_bytes"] = self.max_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+query_cache = QueryCache()
+
+
+def cached_query(func):
+    """Decorator: serve `func` results from `query_cache` until the data changes.
+
+    Calls that pass an explicit connection are not cached, since that
+    connection may hold uncommitted writes of its own.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if kwargs.get("conn") is not None or any(isinstance(a, sqlite3.Connection) for a in args):
+            query_cache.bypass()
+            return func(*args, **kwargs)
+
+        key = (func.__module__, func.__qualname__, _freeze(args), _freeze(kwargs))
+        try:
+            hash(key)
+        except TypeError:
+            query_cache.bypass()
+            return func(*args, **kwargs)
+
+        hit, value_or_version = query_cache.get(key)
+        if hit:
+            return value_or_version
+        value = func(*args, **kwargs)
+        query_cache.put(key, value, value_or_version)
+        return value
+
+    return wrapper
+
+
+def cache_stats():
+    """Return hit/miss/eviction/invalidation counters of the query cache."""
+    return query_cache.stats()
+
+
+def clear_cache():
+    """Drop every cached result."""
+    query_cache.clear()
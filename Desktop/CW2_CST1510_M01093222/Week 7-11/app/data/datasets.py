@@ -1,22 +1,64 @@
-import pandas as pd
-from app.data.db import connect_database
+from app.data.db import pooled_connection
+from app.data.cache import cached_query
+from app.data.bulk import bulk_insert, DEFAULT_CHUNK_SIZE
+from app.data.pagination import fetch_page, DEFAULT_PAGE_SIZE
+from app.data.frames import read_frame
 
-def get_all_datasets():
+@cached_query
+def get_all_datasets(columns=None):
     """
     Retrieve all datasets from the database.
+    Only `columns` are read (default: all); see app.data.frames for the dtypes.
     """
-    conn = connect_database()
-    query = "SELECT * FROM datasets_metadata ORDER BY id DESC"
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+    with pooled_connection() as conn:
+        return read_frame(conn, "datasets_metadata", columns)
 
-def get_datasets_by_category(category):
+@cached_query
+def get_datasets_by_category(category, columns=None):
     """
     Retrieve datasets filtered by category.
     """
-    conn = connect_database()
-    query = "SELECT * FROM datasets_metadata WHERE category = ? ORDER BY id DESC"
-    df = pd.read_sql_query(query, conn, params=(category,))
-    conn.close()
-    return df
\ No newline at end of file
+    with pooled_connection() as conn:
+        return read_frame(conn, "datasets_metadata", columns, where="category = ?", params=(category,))
+
+@cached_query
+def get_datasets_page(before_id=None, limit=DEFAULT_PAGE_SIZE, filters=None, columns=None):
+    """
+    Retrieve one page of datasets, newest first.
+    Returns (DataFrame, next_cursor); next_cursor is None on the last page.
+    """
+    return fetch_page("datasets_metadata", before_id, limit, filters, columns)
+
+@cached_query
+def get_dataset_size_summary():
+    """
+    Count, total and average size of all datasets (sizes in bytes).
+    """
+    query = "SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(size) FROM datasets_metadata"
+    with pooled_connection() as conn:
+        count, total_size, sized = conn.execute(query).fetchone()
+    return {
+        "count": count,
+        "total_size": total_size,
+        "avg_size": total_size / count if count else 0,
+        "has_sizes": sized > 0,
+    }
+
+@cached_query
+def get_largest_datasets(n=10):
+    """
+    Retrieve the `n` largest datasets by size.
+    """
+    with pooled_connection() as conn:
+        return read_frame(conn, "datasets_metadata", ["id", "name", "size"],
+                          where="size IS NOT NULL", order_by="size DESC", limit=n)
+
+def insert_datasets_bulk(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert many datasets in one transaction.
+    Rows are a DataFrame or dicts/tuples with name, source, category, size.
+    Returns BulkInsertResult(inserted).
+    """
+    columns = ['name', 'source', 'category', 'size']
+    with pooled_connection(profile="bulk-ingest") as conn:
+        return bulk_insert(conn, "datasets_metadata", columns, rows, chunk_size=chunk_size)
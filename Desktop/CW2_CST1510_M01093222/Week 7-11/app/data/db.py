@@ -1,7 +1,12 @@
 
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from app.config import get_env_optional
+
 # Default data directory and DB path (anchored to project root)
 # Use the repository/workspace layout so the DB and CSVs are found
 # regardless of the current working directory when the app is run.
@@ -9,24 +14,305 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT_DIR / "DATA"
 DB_PATH = DATA_DIR / "intelligence_platform.db"
 
+# Connection pool settings
+POOL_SIZE = 8              # max open connections per database file
+POOL_TIMEOUT = 10.0        # seconds to wait for a free connection
+HEALTH_CHECK_AFTER = 30.0  # idle seconds before a connection is pinged on checkout
+
+# Named SQLite performance profiles applied to every new connection.
+# Pick one per call with `connect_database(profile=...)`, or set the
+# default with DB_PROFILE in .env.
+PROFILES = {
+    # Streamlit pages: readers never block on the create/update forms
+    "interactive": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,        # KiB (negative = size, not pages)
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # CSV loads and migrations: durability traded for throughput
+    "bulk-ingest": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -131072,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # Dashboards and reports: large cache/mmap, writes refused
+    "read-only-analytics": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "query_only": "ON",
+    },
+}
+DEFAULT_PROFILE = "interactive"
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes free within the timeout."""
+
 
 def _ensure_db_dir(db_path: Path):
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def connect_database(db_path=None):
+def _resolve_profile(profile=None):
+    """Return a known profile name, falling back to DB_PROFILE / the default."""
+    if profile is None:
+        profile = get_env_optional("DB_PROFILE", DEFAULT_PROFILE)
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown database profile '{profile}'. "
+            f"Choose one of: {', '.join(PROFILES)}")
+    return profile
+
+
+def apply_profile(conn, profile):
+    """Apply the PRAGMA settings of a named profile to an open connection."""
+    for pragma, value in PROFILES[_resolve_profile(profile)].items():
+        try:
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        except sqlite3.OperationalError:
+            # journal_mode can't change while another connection holds a
+            # lock; the mode is persistent, so the next connection retries.
+            if pragma != "journal_mode":
+                raise
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool.
+
+    It is still a real sqlite3.Connection, so pandas and existing
+    `conn = connect_database() ... conn.close()` code keep working.
+    """
+
+    _pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def _really_close(self):
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Bounded, thread-affine pool of SQLite connections for one database file.
+
+    Each thread gets back the connection it used last time. Nested checkouts
+    on the same thread share that connection, so helpers that open their own
+    connection inside a caller's connection do not need a second slot.
+    """
+
+    def __init__(self, db_path, profile=DEFAULT_PROFILE, size=POOL_SIZE,
+                 timeout=POOL_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.profile = profile
+        self.size = size
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._idle = {}        # thread id -> idle connection
+        self._in_use = {}      # thread id -> [connection, depth]
+        self._open = 0
+        self._stats = {"checkouts": 0, "reuses": 0, "waits": 0, "opened": 0,
+                       "discarded": 0, "health_failures": 0}
+
+    def _open_connection(self):
+        _ensure_db_dir(self.db_path)
+        conn = sqlite3.connect(str(self.db_path), factory=PooledConnection,
+                               check_same_thread=False)
+        apply_profile(conn, self.profile)
+        conn._pool = self
+        conn._last_used = time.monotonic()
+        self._stats["opened"] += 1
+        return conn
+
+    def _is_healthy(self, conn):
+        if time.monotonic() - conn._last_used < HEALTH_CHECK_AFTER:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            self._stats["health_failures"] += 1
+            return False
+
+    def _discard(self, conn):
+        self._open -= 1
+        self._stats["discarded"] += 1
+        try:
+            conn._really_close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self):
+        """Check out a connection for the calling thread."""
+        tid = threading.get_ident()
+        with self._cond:
+            self._stats["checkouts"] += 1
+
+            held = self._in_use.get(tid)
+            if held is not None:
+                held[1] += 1
+                self._stats["reuses"] += 1
+                return held[0]
+
+            deadline = time.monotonic() + self.timeout
+            waited = False
+            while True:
+                conn = self._idle.pop(tid, None)
+                if conn is None and self._open >= self.size and self._idle:
+                    # Pool is full: adopt another thread's idle connection
+                    conn = self._idle.pop(next(iter(self._idle)))
+                if conn is not None:
+                    if self._is_healthy(conn):
+                        self._stats["reuses"] += 1
+                        break
+                    self._discard(conn)
+                    continue
+                if self._open < self.size:
+                    conn = self._open_connection()
+                    self._open += 1
+                    break
+
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No free database connection after {self.timeout}s "
+                        f"(pool size {self.size})")
+                self._cond.wait(remaining)
+
+            self._in_use[tid] = [conn, 1]
+            return conn
+
+    def release(self, conn):
+        """Return a connection to the pool (called by conn.close())."""
+        tid = threading.get_ident()
+        with self._cond:
+            held = self._in_use.get(tid)
+            if held is None or held[0] is not conn:
+                # Released from a different thread than it was checked out on
+                for owner, entry in self._in_use.items():
+                    if entry[0] is conn:
+                        tid, held = owner, entry
+                        break
+                else:
+                    return
+            held[1] -= 1
+            if held[1] > 0:
+                return
+            del self._in_use[tid]
+
+            # Match plain sqlite3 close(): uncommitted work is discarded
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                self._cond.notify()
+                return
+
+            conn._last_used = time.monotonic()
+            if tid in self._idle:
+                self._discard(self._idle.pop(tid))
+            self._idle[tid] = conn
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and back in."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self):
+        """Return a snapshot of pool counters."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["profile"] = self.profile
+            stats["size"] = self.size
+            stats["open"] = self._open
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = len(self._in_use)
+        checkouts = stats["checkouts"]
+        stats["reuse_ratio"] = stats["reuses"] / checkouts if checkouts else 0.0
+        return stats
+
+    def close_all(self):
+        """Close idle connections. Checked-out ones close when released."""
+        with self._cond:
+            for conn in self._idle.values():
+                self._open -= 1
+                conn._really_close()
+            self._idle.clear()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None, profile=None):
+    """Return the process-wide pool for `db_path` (default `DB_PATH`) and profile."""
+    if db_path is None:
+        db_path = DB_PATH
+    profile = _resolve_profile(profile)
+    key = (str(Path(db_path).resolve()), profile)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path, profile=profile)
+            _pools[key] = pool
+        return pool
+
+
+def connect_database(db_path=None, profile=None):
     """Connect to the SQLite database. Creates parent dir if needed.
 
+    Connections come from a process-wide pool; calling `close()` on the
+    returned connection gives it back to the pool instead of closing it.
+
     Args:
         db_path: Path or string to database file. If None, uses default `DB_PATH`.
+        profile: Name from `PROFILES`. If None, uses DB_PROFILE or "interactive".
 
     Returns:
         sqlite3.Connection
     """
-    if db_path is None:
-        db_path = DB_PATH
-    db_path = Path(db_path)
-    _ensure_db_dir(db_path)
-    return sqlite3.connect(str(db_path))
+    return get_pool(db_path, profile).acquire()
+
+
+@contextmanager
+def pooled_connection(db_path=None, profile=None):
+    """Context manager version of `connect_database`.
+
+    Usage:
+        with pooled_connection() as conn:
+            conn.execute(...)
+    """
+    with get_pool(db_path, profile).connection() as conn:
+        yield conn
+
+
+def pool_stats(db_path=None, profile=None):
+    """Return checkout/wait/reuse counters for the pool of `db_path`."""
+    return get_pool(db_path, profile).stats()
+
 
+def close_all_pools():
+    """Close every idle pooled connection (e.g. at shutdown or in scripts)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
@@ -0,0 +1,101 @@
+"""
+Column projection and compact dtypes for the DataFrame readers.
+
+read_sql_query returns every TEXT column as Python str objects, so a
+severity column of a million rows holds a million small strings. Readers
+go through `read_frame`, which selects only the requested columns and
+converts them with `compact_frame`:
+
+- low-cardinality text (severity, status, priority, category, source)
+  becomes `category`: one small integer code per row plus the distinct
+  values once;
+- ids and sizes become int32 when they fit (never smaller, so arithmetic
+  on them doesn't overflow);
+- date and timestamp strings become datetime64.
+
+Titles and names stay as strings. `memory_report` measures the result
+with memory_usage(deep=True).
+"""
+
+import pandas as pd
+
+# table -> {column: kind}; columns not listed are left as read
+COLUMN_DTYPES = {
+    "cyber_incidents": {"id": "int", "severity": "category", "status": "category",
+                        "date": "datetime", "created_at": "datetime"},
+    "it_tickets": {"id": "int", "priority": "category", "status": "category",
+                   "created_date": "datetime", "created_at": "datetime"},
+    "datasets_metadata": {"id": "int", "source": "category", "category": "category",
+                          "size": "int", "created_at": "datetime"},
+}
+
+
+def get_table_columns(conn, table):
+    """Return the column names of `table` in schema order."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def checked_columns(available, requested, table):
+    """Return `requested` as a list, raising ValueError for unknown columns."""
+    unknown = [col for col in requested if col not in available]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+    return list(requested)
+
+
+def compact_frame(df, table):
+    """Convert the columns of `df` listed in COLUMN_DTYPES[table] in place and return it."""
+    for col, kind in COLUMN_DTYPES.get(table, {}).items():
+        if col not in df.columns:
+            continue
+        if kind == "category":
+            df[col] = df[col].astype("category")
+        elif kind == "int":
+            values = pd.to_numeric(df[col], errors="coerce")
+            if values.hasnans:
+                df[col] = values.astype("Int64")
+            elif values.empty or values.abs().max() < 2 ** 31:
+                df[col] = values.astype("int32")
+            else:
+                df[col] = values.astype("int64")
+        elif kind == "datetime":
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def read_frame(conn, table, columns=None, where=None, params=(), order_by="id DESC", limit=None):
+    """SELECT the given columns of `table` into a compact DataFrame.
+
+    Args:
+        conn: Database connection.
+        table: Table name.
+        columns: Columns to read (default: all).
+        where: Optional SQL condition with ? placeholders.
+        params: Values for the placeholders in `where`.
+        order_by: ORDER BY clause.
+        limit: Optional row limit.
+    """
+    select = "*"
+    if columns:
+        select = ", ".join(checked_columns(get_table_columns(conn, table), columns, table))
+
+    query = f"SELECT {select} FROM {table}"
+    params = list(params)
+    if where:
+        query += f" WHERE {where}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(int(limit))
+
+    return compact_frame(pd.read_sql_query(query, conn, params=params), table)
+
+
+def memory_report(df):
+    """Deep memory use of `df`: {"total": bytes, "columns": {column: bytes}}."""
+    usage = df.memory_usage(deep=True)
+    return {
+        "total": int(usage.sum()),
+        "columns": {col: int(usage[col]) for col in df.columns},
+    }
@@ -1,9 +1,18 @@
+import re
 import pandas as pd
 from pathlib import Path
 from app.data.db import connect_database
+from app.data.cache import cached_query
+from app.data.bulk import bulk_insert, DEFAULT_CHUNK_SIZE
+from app.data.pagination import fetch_page, DEFAULT_PAGE_SIZE
+from app.data.frames import read_frame
+from app.data.rollups import rollup_exists
 
+# Columns the filtered incident readers return
+INCIDENT_COLUMNS = ["id", "title", "severity", "status", "date"]
 
-def insert_incident(title, severity, status, date, conn=None):
+
+def insert_incident(title, severity, status, date, conn=None, description=None):
     """Insert a new incident and return the inserted row id.
 
     If `conn` is not provided a short-lived connection will be used.
@@ -16,10 +25,10 @@ def insert_incident(title, severity, status, date, conn=None):
     cursor = conn.cursor()
     cursor.execute(
         """
-        INSERT INTO cyber_incidents (title, severity, status, date)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO cyber_incidents (title, severity, status, date, description)
+        VALUES (?, ?, ?, ?, ?)
         """,
-        (title, severity, status, date),
+        (title, severity, status, date, description),
     )
     conn.commit()
     incident_id = cursor.lastrowid
@@ -28,20 +37,209 @@ def insert_incident(title, severity, status, date, conn=None):
     return incident_id
 
 
-def get_all_incidents(conn=None):
-    """Retrieve all incidents as pandas DataFrame."""
+def insert_incidents_bulk(rows, chunk_size=DEFAULT_CHUNK_SIZE, conn=None):
+    """Insert many incidents in one transaction.
+
+    Args:
+        rows: DataFrame or iterable of dicts/tuples with
+            title, severity, status, date.
+        chunk_size: Rows per executemany call.
+        conn: Database connection. If None, a bulk-ingest connection is used.
+
+    Returns:
+        BulkInsertResult(inserted)
+    """
+    created_conn = False
+    if conn is None:
+        conn = connect_database(profile="bulk-ingest")
+        created_conn = True
+
+    try:
+        return bulk_insert(conn, "cyber_incidents", ["title", "severity", "status", "date"],
+                           rows, chunk_size=chunk_size)
+    finally:
+        if created_conn:
+            conn.close()
+
+
+@cached_query
+def get_all_incidents(conn=None, columns=None):
+    """Retrieve all incidents as a compact pandas DataFrame.
+
+    Args:
+        conn: Optional database connection.
+        columns: Columns to read (default: all). Severity and status come
+            back as categoricals, ids as integers and dates parsed.
+    """
+    created_conn = False
+    if conn is None:
+        conn = connect_database()
+        created_conn = True
+
+    df = read_frame(conn, "cyber_incidents", columns)
+    if created_conn:
+        conn.close()
+    return df
+
+
+@cached_query
+def get_incidents_page(before_id=None, limit=DEFAULT_PAGE_SIZE, filters=None,
+                       columns=None, conn=None):
+    """Retrieve one page of incidents, newest first.
+
+    Returns:
+        tuple (DataFrame, next_cursor); pass next_cursor as `before_id`
+        to get the following page. It is None on the last page.
+    """
+    return fetch_page("cyber_incidents", before_id, limit, filters, columns, conn)
+
+
+def _fts_query(text):
+    """Turn free text into a safe FTS5 query: every word must match,
+    the last one as a prefix so results appear while typing."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+@cached_query
+def search_incidents(query, limit=20, conn=None):
+    """
+    Full-text search over incident titles and descriptions.
+
+    Args:
+        query: Free text typed by the user.
+        limit: Maximum number of hits.
+        conn: Database connection (optional).
+
+    Returns:
+        pandas.DataFrame: Best matches first, with a `snippet` column.
+    """
+    fts_query = _fts_query(query)
+    if fts_query is None:
+        return pd.DataFrame(columns=["id", "title", "severity", "status", "date", "snippet"])
+
     created_conn = False
     if conn is None:
         conn = connect_database()
         created_conn = True
 
-    df = pd.read_sql_query("SELECT * FROM cyber_incidents ORDER BY id DESC", conn)
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'incidents_fts'"
+    ).fetchone()
+    if has_fts:
+        # Title hits weigh more than description hits
+        sql = """
+            SELECT c.id, c.title, c.severity, c.status, c.date,
+                   snippet(incidents_fts, 1, '**', '**', '…', 12) AS snippet
+            FROM incidents_fts
+            JOIN cyber_incidents c ON c.id = incidents_fts.rowid
+            WHERE incidents_fts MATCH ?
+            ORDER BY bm25(incidents_fts, 10.0, 1.0)
+            LIMIT ?
+        """
+        params = (fts_query, limit)
+    else:
+        # SQLite without FTS5: unranked substring match
+        sql = """
+            SELECT id, title, severity, status, date, description AS snippet
+            FROM cyber_incidents
+            WHERE title LIKE ? OR description LIKE ?
+            ORDER BY id DESC
+            LIMIT ?
+        """
+        pattern = f"%{query.strip()}%"
+        params = (pattern, pattern, limit)
+
+    df = pd.read_sql_query(sql, conn, params=params)
     if created_conn:
         conn.close()
     return df
 
 
 
+@cached_query
+def get_incident_by_id(incident_id, conn=None):
+    """
+    Retrieve one incident by primary key.
+
+    Returns:
+        dict of column -> value, or None if no incident has that id.
+    """
+    created_conn = False
+    if conn is None:
+        conn = connect_database()
+        created_conn = True
+
+    cursor = conn.execute("SELECT * FROM cyber_incidents WHERE id = ?", (int(incident_id),))
+    row = cursor.fetchone()
+    columns = [col[0] for col in cursor.description]
+    if created_conn:
+        conn.close()
+    return dict(zip(columns, row)) if row is not None else None
+
+
+@cached_query
+def get_incident_options(query="", limit=50, conn=None):
+    """
+    (id, title) pairs for incident pickers, at most `limit` of them.
+
+    An empty query lists the newest incidents; digits match an id exactly;
+    other text matches titles (full-text, newest first). Every branch is an
+    index lookup that stops after `limit` rows.
+    """
+    created_conn = False
+    if conn is None:
+        conn = connect_database()
+        created_conn = True
+
+    query = query.strip()
+    fts_query = _fts_query(query)
+    if not query:
+        options = conn.execute(
+            "SELECT id, title FROM cyber_incidents ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    else:
+        options = []
+        if query.isdigit():
+            options = conn.execute(
+                "SELECT id, title FROM cyber_incidents WHERE id = ?", (int(query),)
+            ).fetchall()
+
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'incidents_fts'"
+        ).fetchone()
+        if has_fts and fts_query is not None:
+            # Newest first: FTS5 walks rowids backwards and stops at `limit`,
+            # where ranking would have to score every match
+            matches = conn.execute("""
+                SELECT c.id, c.title
+                FROM (
+                    SELECT rowid FROM incidents_fts
+                    WHERE incidents_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                ) AS hits
+                JOIN cyber_incidents c ON c.id = hits.rowid
+                ORDER BY c.id DESC
+            """, (f"title : ({fts_query})", limit)).fetchall()
+        else:
+            matches = conn.execute(
+                "SELECT id, title FROM cyber_incidents WHERE title LIKE ? ORDER BY id DESC LIMIT ?",
+                (f"%{query}%", limit),
+            ).fetchall()
+        seen = {row[0] for row in options}
+        options += [row for row in matches if row[0] not in seen]
+
+    if created_conn:
+        conn.close()
+    return [tuple(row) for row in options[:limit]]
+
+
+
 def get_incidents_by_status(conn, incident_id, new_status):
     """
     update the status of an incident.
@@ -103,14 +301,24 @@ def get_high_severity_status(conn):
     """
     Count high severity incidents by status.
     Uses: SELECT, FROM, WHERE, GROUP BY, ORDER BY
+    Sums the incident_rollup buckets when migration 3 has created them.
     """
-    query = """
-    SELECT status, COUNT(*) as count
-    FROM cyber_incidents
-    WHERE severity = 'High'
-    GROUP BY status
-    ORDER BY count DESC
-    """
+    if rollup_exists(conn, "incident_rollup"):
+        query = """
+        SELECT NULLIF(status, '') as status, SUM(count) as count
+        FROM incident_rollup
+        WHERE severity = 'High'
+        GROUP BY status
+        ORDER BY count DESC
+        """
+    else:
+        query = """
+        SELECT status, COUNT(*) as count
+        FROM cyber_incidents
+        WHERE severity = 'High'
+        GROUP BY status
+        ORDER BY count DESC
+        """
     df = pd.read_sql_query(query, conn)
     return df
 
@@ -144,13 +352,8 @@ def get_incidents_by_severity(conn, severity):
     Returns:
         pandas.DataFrame: Filtered incidents
     """
-    query = """
-        SELECT id, title, severity, status, date
-        FROM cyber_incidents
-        WHERE severity = ?
-    """
-    df = pd.read_sql_query(query, conn, params=(severity,))
-    return df
+    return read_frame(conn, "cyber_incidents", INCIDENT_COLUMNS,
+                      where="severity = ?", params=(severity,), order_by=None)
 
 
 
@@ -165,11 +368,6 @@ def get_incidents_by_status(conn, status):
     Returns:
         pandas.DataFrame: Filtered incidents
     """
-    query = """
-        SELECT id, title, severity, status, date
-        FROM cyber_incidents
-        WHERE status = ?
-    """
-    df = pd.read_sql_query(query, conn, params=(status,))
-    return df
+    return read_frame(conn, "cyber_incidents", INCIDENT_COLUMNS,
+                      where="status = ?", params=(status,), order_by=None)
 
@@ -0,0 +1,156 @@
+"""
+Chunked CSV ingestion into the platform tables.
+
+A file is read `chunk_size` rows at a time, headers are normalised
+("Created Date " -> "created_date"), each chunk is coerced to the table's
+column types, rows missing required fields are rejected, and the rest is
+written with one bulk transaction per chunk. Rows whose id (or other
+unique key) already exists are skipped and counted separately, so
+re-loading an unchanged file reports skipped rows, not rejected ones. Peak memory is one chunk,
+whatever the file size.
+"""
+
+import time
+from collections import namedtuple
+
+from app.data.db import connect_database, DATA_DIR
+from app.data.bulk import bulk_insert
+
+DEFAULT_INGEST_CHUNK_SIZE = 50_000
+
+# table -> column types, required columns, and CSV header handling
+TABLE_SPECS = {
+    "cyber_incidents": {
+        "columns": {"id": "int", "title": "str", "severity": "str",
+                    "status": "str", "date": "date", "description": "str"},
+        "required": ["title", "severity"],
+    },
+    "it_tickets": {
+        "columns": {"id": "int", "title": "str", "priority": "str",
+                    "status": "str", "created_date": "date"},
+        "required": ["title", "priority"],
+    },
+    "datasets_metadata": {
+        "columns": {"id": "int", "name": "str", "source": "str",
+                    "category": "str", "size": "int"},
+        "required": ["name"],
+    },
+    # users.txt has no header row: username,password_hash,role
+    "users_data": {
+        "columns": {"username": "str", "password_hash": "str", "role": "str"},
+        "required": ["username", "password_hash"],
+        "header": None,
+    },
+}
+
+IngestResult = namedtuple(
+    "IngestResult",
+    ["table", "rows_read", "rows_written", "rows_rejected", "rows_skipped",
+     "seconds", "rows_per_sec"],
+)
+
+
+def normalise_headers(columns):
+    """Strip, lower-case and snake_case CSV headers."""
+    return [
+        str(col).strip().lower().replace(" ", "_").replace("-", "_")
+        for col in columns
+    ]
+
+
+def coerce_chunk(chunk, spec):
+    """Coerce one chunk to the spec's types and drop rows missing required values.
+
+    Returns:
+        tuple (clean DataFrame with only known columns, number of rejected rows)
+    """
+    import pandas as pd
+
+    columns = [col for col in spec["columns"] if col in chunk.columns]
+    chunk = chunk[columns].copy()
+
+    for col in columns:
+        kind = spec["columns"][col]
+        if kind == "int":
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype("Int64")
+        elif kind == "date":
+            parsed = pd.to_datetime(chunk[col], errors="coerce")
+            chunk[col] = parsed.dt.strftime("%Y-%m-%d")
+        else:
+            values = chunk[col].astype("string").str.strip()
+            chunk[col] = values.mask(values == "")
+
+    required = [col for col in spec["required"] if col in columns]
+    missing = [col for col in spec["required"] if col not in columns]
+    if missing:
+        return chunk.iloc[0:0], len(chunk)
+
+    valid = chunk[required].notna().all(axis=1)
+    return chunk[valid], int((~valid).sum())
+
+
+def ingest_csv(path, table, conn=None, chunk_size=DEFAULT_INGEST_CHUNK_SIZE,
+               on_conflict="ignore", progress=None):
+    """Stream a CSV file into `table`.
+
+    Args:
+        path: CSV file.
+        table: One of TABLE_SPECS.
+        conn: Database connection. If None, a bulk-ingest connection is used.
+        chunk_size: Rows read, validated and committed at a time.
+        on_conflict: Passed to bulk_insert; "ignore" skips ids that already exist.
+        progress: Optional callback(IngestResult) called after every chunk.
+
+    Returns:
+        IngestResult
+    """
+    # pandas is only needed when a file is actually read; the bootstrap
+    # imports this module on every start just to compare fingerprints
+    import pandas as pd
+
+    spec = TABLE_SPECS[table]
+    created_conn = False
+    if conn is None:
+        conn = connect_database(profile="bulk-ingest")
+        created_conn = True
+
+    read = written = rejected = skipped = 0
+    start = time.perf_counter()
+
+    def snapshot():
+        seconds = time.perf_counter() - start
+        rate = written / seconds if seconds > 0 else 0.0
+        return IngestResult(table, read, written, rejected, skipped, seconds, rate)
+
+    header = spec.get("header", "infer")
+    names = list(spec["columns"]) if header is None else None
+    try:
+        reader = pd.read_csv(path, chunksize=chunk_size, dtype=str, header=header,
+                             names=names, skipinitialspace=True, on_bad_lines="skip")
+        for chunk in reader:
+            chunk.columns = normalise_headers(chunk.columns)
+            clean, bad = coerce_chunk(chunk, spec)
+            read += len(chunk)
+            rejected += bad
+            if len(clean):
+                result = bulk_insert(conn, table, list(clean.columns), clean,
+                                     chunk_size=len(clean), on_conflict=on_conflict)
+                written += result.inserted
+                skipped += len(clean) - result.inserted
+            if progress is not None:
+                progress(snapshot())
+    finally:
+        if created_conn:
+            conn.close()
+
+    return snapshot()
+
+
+def find_source_file(keyword, data_dir=DATA_DIR):
+    """Return the first file in `data_dir` whose name contains `keyword`."""
+    if not data_dir.exists():
+        return None
+    for path in sorted(data_dir.iterdir()):
+        if path.is_file() and keyword in path.name.lower():
+            return path
+    return None
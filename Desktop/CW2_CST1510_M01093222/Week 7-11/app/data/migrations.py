@@ -0,0 +1,188 @@
+"""
+Versioned schema migrations keyed on SQLite's PRAGMA user_version.
+
+Each migration runs in its own transaction. Before it is committed, every
+query listed in its `checks` is run through EXPLAIN QUERY PLAN; if any of
+them would still scan the whole table the migration is rolled back and
+MigrationError is raised. ANALYZE runs after the checks pass, so the
+checks are about the schema rather than today's (possibly tiny) tables.
+"""
+
+from app.data.db import connect_database
+from app.data.schema import (
+    add_incident_description_column,
+    create_incidents_fts,
+    create_rollup_tables,
+    fts5_available,
+)
+
+
+class MigrationError(RuntimeError):
+    """Raised when a migration fails or its query plan checks do not pass."""
+
+
+def _migration_1_hot_query_indexes(conn):
+    """Indexes for the severity/status/priority/category lookups."""
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_incidents_severity_status_date
+        ON cyber_incidents (severity, status, date)
+    """)
+    # (severity, status, date) can't serve a status-only filter
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_incidents_status_date
+        ON cyber_incidents (status, date)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tickets_priority_status
+        ON it_tickets (priority, status)
+    """)
+    # `WHERE priority = ? ORDER BY id DESC` needs rowid right after priority,
+    # otherwise the planner prefers a full scan once ANALYZE has run
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tickets_priority
+        ON it_tickets (priority)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_datasets_category
+        ON datasets_metadata (category)
+    """)
+
+
+def _migration_2_incident_search(conn):
+    """Incident descriptions plus a trigger-maintained FTS5 index."""
+    add_incident_description_column(conn)
+    if fts5_available(conn):
+        create_incidents_fts(conn)
+    else:
+        print("⚠️ SQLite was built without FTS5; incident search will use LIKE.")
+
+
+def _migration_3_rollups(conn):
+    """Trigger-maintained day x category x status count tables."""
+    create_rollup_tables(conn)
+
+
+# (version, description, apply function, [(query, params), ...] that must use an index)
+MIGRATIONS = [
+    (
+        1,
+        "Indexes for hot incident/ticket/dataset queries",
+        _migration_1_hot_query_indexes,
+        [
+            ("SELECT id, title, severity, status, date FROM cyber_incidents WHERE severity = ?", ("High",)),
+            ("SELECT id, title, severity, status, date FROM cyber_incidents WHERE status = ?", ("Open",)),
+            ("SELECT * FROM it_tickets WHERE priority = ? ORDER BY id DESC", ("high",)),
+            ("SELECT * FROM datasets_metadata WHERE category = ? ORDER BY id DESC", ("security",)),
+        ],
+    ),
+    (
+        2,
+        "Incident descriptions and full-text search",
+        _migration_2_incident_search,
+        [],
+    ),
+    (
+        3,
+        "Incident and ticket rollup tables",
+        _migration_3_rollups,
+        [
+            ("SELECT status, SUM(count) FROM incident_rollup WHERE day = ? GROUP BY status", ("2024-11-25",)),
+            ("SELECT status, SUM(count) FROM ticket_rollup WHERE day = ? GROUP BY status", ("2024-11-25",)),
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def analyze_tables(conn):
+    """ANALYZE every ordinary table, skipping virtual tables and their shadow tables.
+
+    Stats taken on an FTS5 index's (near-empty) shadow tables make FTS5's
+    own lookups pick poor plans later, which slows every trigger insert.
+    """
+    virtual = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'")]
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    for table in tables:
+        if table in virtual or any(table.startswith(f"{name}_") for name in virtual):
+            continue
+        conn.execute(f'ANALYZE "{table}"')
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def explain_query_plan(conn, query, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def uses_index(plan):
+    """True if the plan searches an index and never scans a whole table/index."""
+    # WITHOUT ROWID tables report their clustered key as "USING PRIMARY KEY"
+    searches = [step for step in plan if step.startswith("SEARCH")
+                and ("INDEX" in step or "PRIMARY KEY" in step)]
+    scans = [step for step in plan if step.startswith("SCAN")]
+    return bool(searches) and not scans
+
+
+def check_query_plans(conn, checks):
+    """Return a list of (query, plan) pairs that do not use an index."""
+    failures = []
+    for query, params in checks:
+        plan = explain_query_plan(conn, query, params)
+        if not uses_index(plan):
+            failures.append((query, plan))
+    return failures
+
+
+def run_migrations(conn=None, target=None):
+    """Apply every migration newer than the database's user_version.
+
+    Args:
+        conn: Database connection. If None, a pooled connection is used.
+        target: Stop after this version (default: latest).
+
+    Returns:
+        int: The schema version after running.
+    """
+    created_conn = False
+    if conn is None:
+        conn = connect_database()
+        created_conn = True
+
+    try:
+        if conn.in_transaction:
+            conn.commit()
+        current = get_schema_version(conn)
+        for version, description, apply, checks in MIGRATIONS:
+            if version <= current or (target is not None and version > target):
+                continue
+
+            conn.execute("BEGIN")
+            try:
+                apply(conn)
+                failures = check_query_plans(conn, checks)
+                if failures:
+                    details = "\n".join(f"  {q}\n    -> {'; '.join(p)}" for q, p in failures)
+                    raise MigrationError(
+                        f"Migration {version} ({description}) left queries without "
+                        f"an index:\n{details}")
+                analyze_tables(conn)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            current = version
+            print(f"✅ Migration {version} applied: {description}")
+        return current
+    finally:
+        if created_conn:
+            conn.close()
@@ -0,0 +1,87 @@
+"""
+Keyset (cursor) pagination for the id-ordered tables.
+
+Pages are read newest first with `WHERE id < cursor ORDER BY id DESC LIMIT n`,
+so every page costs the same no matter how deep the user pages or how big
+the table is (unlike OFFSET, which re-reads every skipped row).
+"""
+
+import pandas as pd
+
+from app.data.db import pooled_connection
+from app.data.cache import cached_query
+from app.data.frames import compact_frame, get_table_columns, checked_columns as _checked_columns
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def _fetch_page(conn, table, before_id, limit, filters, columns):
+    available = get_table_columns(conn, table)
+
+    if columns:
+        columns = _checked_columns(available, columns, table)
+        if "id" not in columns:
+            columns = ["id"] + columns
+        select = ", ".join(columns)
+    else:
+        select = "*"
+
+    where = []
+    params = []
+    if before_id is not None:
+        where.append("id < ?")
+        params.append(int(before_id))
+    for col in _checked_columns(available, list((filters or {}).keys()), table):
+        where.append(f"{col} = ?")
+        params.append(filters[col])
+
+    query = f"SELECT {select} FROM {table}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    # One extra row tells us whether another page exists
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(int(limit) + 1)
+
+    df = compact_frame(pd.read_sql_query(query, conn, params=params), table)
+    next_cursor = None
+    if len(df) > limit:
+        df = df.iloc[:limit]
+        next_cursor = int(df["id"].iloc[-1])
+    return df, next_cursor
+
+
+def fetch_page(table, before_id=None, limit=DEFAULT_PAGE_SIZE, filters=None,
+               columns=None, conn=None):
+    """Read one page of `table`, newest rows first.
+
+    Args:
+        table: Table name (must have an integer `id` primary key).
+        before_id: Cursor from the previous page; None for the first page.
+        limit: Rows per page.
+        filters: Optional {column: value} equality filters.
+        columns: Optional list of columns to return (`id` is always included).
+        conn: Database connection. If None, a pooled connection is used.
+
+    Returns:
+        tuple (DataFrame, next_cursor) where next_cursor is None on the last page.
+    """
+    if conn is not None:
+        return _fetch_page(conn, table, before_id, limit, filters, columns)
+    with pooled_connection() as conn:
+        return _fetch_page(conn, table, before_id, limit, filters, columns)
+
+
+@cached_query
+def get_distinct_values(table, column, conn=None):
+    """Return the sorted distinct non-null values of one column (for filter menus)."""
+    def _query(conn):
+        _checked_columns(get_table_columns(conn, table), [column], table)
+        rows = conn.execute(
+            f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY 1"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    if conn is not None:
+        return _query(conn)
+    with pooled_connection() as conn:
+        return _query(conn)
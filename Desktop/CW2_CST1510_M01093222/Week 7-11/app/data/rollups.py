@@ -0,0 +1,58 @@
+"""
+Rollup tables: pre-counted incidents and tickets per day, category and status.
+
+The tables and their triggers are created by migration 3 (see
+schema.create_rollup_tables). Triggers keep them exact on every insert,
+update and delete; `rebuild_rollups` recounts them from scratch, e.g. after
+rows were changed with the triggers absent:
+
+    python -m app.data.rollups
+"""
+
+from app.data.db import connect_database
+from app.data.schema import ROLLUPS, rebuild_rollup
+
+
+def rollup_exists(conn, rollup):
+    """True once migration 3 has created `rollup` in this database."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (rollup,)
+    ).fetchone()
+    return row is not None
+
+
+def rebuild_rollups(conn=None):
+    """Recount every rollup table in one transaction.
+
+    Returns:
+        dict: {rollup table: number of buckets}
+    """
+    created_conn = False
+    if conn is None:
+        conn = connect_database(profile="bulk-ingest")
+        created_conn = True
+
+    try:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            buckets = {}
+            for rollup in ROLLUPS:
+                if not rollup_exists(conn, rollup):
+                    continue
+                rebuild_rollup(conn, rollup)
+                buckets[rollup] = conn.execute(f"SELECT COUNT(*) FROM {rollup}").fetchone()[0]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return buckets
+    finally:
+        if created_conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    for name, count in rebuild_rollups().items():
+        print(f"✅ Rebuilt {name}: {count} buckets")
@@ -31,6 +31,7 @@ def create_cyber_incidents_table(conn):
         severity TEXT NOT NULL,
         status Text DEFAULT 'Open',
         date TEXT,
+        description TEXT,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
     """
@@ -87,10 +88,216 @@ def create_it_tickets_table(conn):
     print("✅ IT Tickets table created successfully!")
 
 
+def create_users_data_table(conn):
+    """Raw copy of DATA/users.txt used by the Analytics page."""
+    cursor = conn.cursor()
+
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS users_data (
+        username TEXT,
+        password_hash TEXT,
+        role TEXT
+    )
+    """
+
+    cursor.execute(create_table_sql)
+    conn.commit()
+
+
+def create_ingest_sources_table(conn):
+    """Fingerprint of the last CSV loaded into each table (see app/data/bootstrap.py)."""
+    cursor = conn.cursor()
+
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS ingest_sources (
+        table_name TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        sha256 TEXT NOT NULL,
+        rows_written INTEGER NOT NULL,
+        ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+
+    cursor.execute(create_table_sql)
+    conn.commit()
+
+
+def create_user_sessions_table(conn):
+    """Login sessions issued by app/services/session_store.py."""
+    cursor = conn.cursor()
+
+    create_table_sql = """
+    CREATE TABLE IF NOT EXISTS user_sessions (
+        session_id TEXT PRIMARY KEY,
+        username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+        issued_at INTEGER NOT NULL,
+        expires_at INTEGER NOT NULL,
+        revoked INTEGER NOT NULL DEFAULT 0
+    )
+    """
+
+    cursor.execute(create_table_sql)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_expires ON user_sessions (expires_at)")
+    conn.commit()
+
+
+def add_incident_description_column(conn):
+    """Add cyber_incidents.description to databases created before it existed.
+
+    Runs inside the caller's migration transaction, so it does not commit.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(cyber_incidents)")]
+    if "description" not in columns:
+        conn.execute("ALTER TABLE cyber_incidents ADD COLUMN description TEXT")
+
+
+def fts5_available(conn):
+    """True if this SQLite build has the FTS5 extension."""
+    options = [row[0] for row in conn.execute("PRAGMA compile_options")]
+    return "ENABLE_FTS5" in options
+
+
+def create_incidents_fts(conn):
+    """Full-text index over incident title/description, kept in sync by triggers.
+
+    `incidents_fts` is an external-content FTS5 table: it stores only the
+    index and reads the text from cyber_incidents, so it costs little disk.
+    Runs inside the caller's migration transaction, so it does not commit.
+    """
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS incidents_fts USING fts5(
+        title,
+        description,
+        content='cyber_incidents',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """)
+
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS incidents_fts_insert AFTER INSERT ON cyber_incidents
+    BEGIN
+        INSERT INTO incidents_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """)
+
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS incidents_fts_delete AFTER DELETE ON cyber_incidents
+    BEGIN
+        INSERT INTO incidents_fts (incidents_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """)
+
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS incidents_fts_update AFTER UPDATE OF title, description ON cyber_incidents
+    BEGIN
+        INSERT INTO incidents_fts (incidents_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO incidents_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """)
+
+    # Index the rows that existed before the triggers
+    conn.execute("INSERT INTO incidents_fts (incidents_fts) VALUES ('rebuild')")
+
+
+# rollup table -> (base table, day column, category column)
+ROLLUPS = {
+    "incident_rollup": ("cyber_incidents", "date", "severity"),
+    "ticket_rollup": ("it_tickets", "created_date", "priority"),
+}
+
+
+def _rollup_key(prefix, day_col, category_col):
+    """Bucket key expressions for a base-table row (`prefix` is new/old or empty).
+
+    NULLs are stored as '' so the bucket can be a primary key.
+    """
+    p = f"{prefix}." if prefix else ""
+    return (f"COALESCE(substr({p}{day_col}, 1, 10), '')",
+            f"COALESCE({p}{category_col}, '')",
+            f"COALESCE({p}status, '')")
+
+
+def create_rollup_tables(conn):
+    """Per-day count tables for incidents and tickets, kept current by triggers.
+
+    incident_rollup holds one row per (day, severity, status) and
+    ticket_rollup one per (day, priority, status), so dashboards sum a few
+    hundred buckets instead of counting every row. Values keep their
+    original case; readers normalise. Runs inside the caller's migration
+    transaction, so it does not commit.
+    """
+    for rollup, (table, day_col, category_col) in ROLLUPS.items():
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {rollup} (
+            day TEXT NOT NULL,
+            {category_col} TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, {category_col}, status)
+        ) WITHOUT ROWID
+        """)
+
+        new_key = ", ".join(_rollup_key("new", day_col, category_col))
+        old_key = " AND ".join(
+            f"{col} = {expr}" for col, expr in
+            zip(("day", category_col, "status"), _rollup_key("old", day_col, category_col)))
+        increment = f"""
+            INSERT INTO {rollup} (day, {category_col}, status, count)
+            VALUES ({new_key}, 1)
+            ON CONFLICT (day, {category_col}, status) DO UPDATE SET count = count + 1;
+        """
+        decrement = f"""
+            UPDATE {rollup} SET count = count - 1 WHERE {old_key};
+            DELETE FROM {rollup} WHERE {old_key} AND count <= 0;
+        """
+
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {rollup}_insert AFTER INSERT ON {table}
+        BEGIN {increment} END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {rollup}_delete AFTER DELETE ON {table}
+        BEGIN {decrement} END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {rollup}_update
+        AFTER UPDATE OF {day_col}, {category_col}, status ON {table}
+        BEGIN {decrement} {increment} END
+        """)
+
+        rebuild_rollup(conn, rollup)
+
+
+def rebuild_rollup(conn, rollup):
+    """Recount one rollup table from its base table (does not commit)."""
+    table, day_col, category_col = ROLLUPS[rollup]
+    key = ", ".join(_rollup_key("", day_col, category_col))
+    conn.execute(f"DELETE FROM {rollup}")
+    conn.execute(f"""
+        INSERT INTO {rollup} (day, {category_col}, status, count)
+        SELECT {key}, COUNT(*) FROM {table} GROUP BY 1, 2, 3
+    """)
+
+
 def create_all_tables(conn):
-    """Create all tables for the intelligence platform."""
+    """Create all tables for the intelligence platform, then run migrations."""
+    # Imported here: migrations build on the table functions in this module
+    from app.data.migrations import run_migrations
+
     create_users_table(conn)
+    create_user_sessions_table(conn)
     create_cyber_incidents_table(conn)
     create_datasets_metadata_table(conn)
     create_it_tickets_table(conn)
-    print("\n All tables created successfully!")
\ No newline at end of file
+    print("\n All tables created successfully!")
+
+    version = run_migrations(conn)
+    print(f" Schema is at version {version}")
@@ -1,22 +1,40 @@
-import pandas as pd
-from app.data.db import connect_database
+from app.data.db import pooled_connection
+from app.data.cache import cached_query
+from app.data.bulk import bulk_insert, DEFAULT_CHUNK_SIZE
+from app.data.pagination import fetch_page, DEFAULT_PAGE_SIZE
+from app.data.frames import read_frame
 
-def get_all_tickets():
+@cached_query
+def get_all_tickets(columns=None):
     """
     Retrieve all IT tickets from the database.
+    Only `columns` are read (default: all); see app.data.frames for the dtypes.
     """
-    conn = connect_database()
-    query = "SELECT * FROM it_tickets ORDER BY id DESC"
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+    with pooled_connection() as conn:
+        return read_frame(conn, "it_tickets", columns)
 
-def get_tickets_by_priority(priority):
+@cached_query
+def get_tickets_by_priority(priority, columns=None):
     """
     Retrieve tickets filtered by priority.
     """
-    conn = connect_database()
-    query = "SELECT * FROM it_tickets WHERE priority = ? ORDER BY id DESC"
-    df = pd.read_sql_query(query, conn, params=(priority,))
-    conn.close()
-    return df
\ No newline at end of file
+    with pooled_connection() as conn:
+        return read_frame(conn, "it_tickets", columns, where="priority = ?", params=(priority,))
+
+@cached_query
+def get_tickets_page(before_id=None, limit=DEFAULT_PAGE_SIZE, filters=None, columns=None):
+    """
+    Retrieve one page of tickets, newest first.
+    Returns (DataFrame, next_cursor); next_cursor is None on the last page.
+    """
+    return fetch_page("it_tickets", before_id, limit, filters, columns)
+
+def insert_tickets_bulk(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert many tickets in one transaction.
+    Rows are a DataFrame or dicts/tuples with title, priority, status, created_date.
+    Returns BulkInsertResult(inserted).
+    """
+    columns = ['title', 'priority', 'status', 'created_date']
+    with pooled_connection(profile="bulk-ingest") as conn:
+        return bulk_insert(conn, "it_tickets", columns, rows, chunk_size=chunk_size)
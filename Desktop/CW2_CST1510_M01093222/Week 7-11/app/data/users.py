@@ -1,39 +1,60 @@
-from app.data.db import connect_database
+from app.data.db import pooled_connection
+from app.data.cache import cached_query
 
 def get_user_by_username(username):
     """
     Retrieve user by username.
     """
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM users WHERE username = ?",
-        (username,)
-    )
-    user = cursor.fetchone()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM users WHERE username = ?",
+            (username,)
+        )
+        user = cursor.fetchone()
     return user
 
 def insert_user(username, password_hash, role='user'):
     """
     Insert new user.
     """
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-        (username, password_hash, role)
-    )
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            (username, password_hash, role)
+        )
+        conn.commit()
 
+@cached_query
 def get_all_users():
     """
     Retrieve all users from the database.
     """
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, username, role FROM users")
-    users = cursor.fetchall()
-    conn.close()
-    return users
\ No newline at end of file
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, username, role FROM users")
+        users = cursor.fetchall()
+    return users
+
+@cached_query
+def get_password_cost_counts():
+    """
+    Number of users per bcrypt cost, read from each hash's "$2b$NN$" prefix.
+    Hashes that are not bcrypt are counted under None.
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT CASE WHEN password_hash GLOB '$2*$[0-9][0-9]$*'
+                        THEN CAST(substr(password_hash, instr(substr(password_hash, 2), '$') + 2, 2) AS INTEGER)
+                   END AS cost,
+                   COUNT(*)
+            FROM users
+            GROUP BY cost
+            ORDER BY cost
+            """
+        )
+        counts = cursor.fetchall()
+    return dict(counts)
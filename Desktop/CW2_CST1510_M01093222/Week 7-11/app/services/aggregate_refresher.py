@@ -0,0 +1,208 @@
+"""
+Platform-wide dashboard aggregates, recomputed by one background thread.
+
+Without this every session on the Dashboard and Analytics pages runs the
+same GROUP BY queries as soon as the data changes. Instead a single
+daemon thread per process recomputes all of AGGREGATES whenever the
+database's `PRAGMA data_version` moves (checked every POLL_INTERVAL_S
+through the query cache's watcher connection) or REFRESH_INTERVAL_S has
+passed, and publishes the results as one immutable AggregateSnapshot.
+Pages read the latest snapshot, which is a single attribute lookup.
+
+Each aggregate is computed on its own: if one reader fails (say its table
+does not exist yet) the error is logged, the snapshot keeps that
+aggregate's previous value (or leaves it out if there is none) and lists
+it in `errors`; the other aggregates are still refreshed.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from app.config import get_env_optional
+from app.data.db import pooled_connection
+from app.data.cache import query_cache
+from app.data.aggregates import (
+    get_incident_counts,
+    get_ticket_counts,
+    get_dataset_counts,
+    get_user_role_counts,
+)
+
+REFRESH_INTERVAL_S = float(get_env_optional("AGGREGATE_REFRESH_SECONDS", "60"))
+POLL_INTERVAL_S = 1.0
+FIRST_SNAPSHOT_TIMEOUT_S = 10.0
+
+logger = logging.getLogger(__name__)
+
+# snapshot key -> reader taking conn=
+AGGREGATES = {
+    "incident_counts": get_incident_counts,
+    "ticket_counts": get_ticket_counts,
+    "dataset_counts": get_dataset_counts,
+    "user_role_counts": get_user_role_counts,
+}
+
+
+def _frozen(value):
+    """Read-only copy of nested dicts/lists, safe to share between sessions."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class AggregateSnapshot:
+    """Every aggregate as of one database version."""
+
+    values: MappingProxyType
+    data_version: int
+    computed_at: float
+    duration_ms: float
+    errors: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))  # name -> error
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def get(self, name, default=None):
+        """Aggregate `name`, or `default` if it has never been computed."""
+        return self.values.get(name, default)
+
+    def age(self):
+        """Seconds since the snapshot was computed."""
+        return time.time() - self.computed_at
+
+
+class AggregateRefresher:
+    """Background thread that keeps an AggregateSnapshot up to date."""
+
+    def __init__(self, aggregates=AGGREGATES, interval=REFRESH_INTERVAL_S,
+                 poll_interval=POLL_INTERVAL_S):
+        self.aggregates = dict(aggregates)
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._attempted = threading.Event()
+        self._stats = {"refreshes": 0, "errors": 0, "last_error": None}
+
+    def refresh(self):
+        """Recompute every aggregate in one read transaction and publish the result.
+
+        An aggregate whose reader raises keeps its value from the previous
+        snapshot; the error is logged and recorded in the new snapshot.
+        """
+        version = query_cache.data_version()
+        started = time.perf_counter()
+        previous = self._snapshot
+        values, errors = {}, {}
+        with pooled_connection(profile="read-only-analytics") as conn:
+            conn.execute("BEGIN")
+            try:
+                for name, reader in self.aggregates.items():
+                    try:
+                        values[name] = _frozen(reader(conn=conn))
+                    except Exception as e:
+                        logger.warning("Aggregate %s failed to refresh: %s", name, e)
+                        errors[name] = str(e)
+                        if previous is not None and name in previous.values:
+                            values[name] = previous.values[name]
+            finally:
+                conn.rollback()
+
+        snapshot = AggregateSnapshot(
+            values=MappingProxyType(values),
+            data_version=version,
+            computed_at=time.time(),
+            duration_ms=(time.perf_counter() - started) * 1000,
+            errors=MappingProxyType(errors),
+        )
+        with self._lock:
+            self._snapshot = snapshot
+            self._stats["refreshes"] += 1
+            if errors:
+                self._stats["errors"] += len(errors)
+                name = next(iter(errors))
+                self._stats["last_error"] = f"{name}: {errors[name]}"
+        return snapshot
+
+    def _is_stale(self):
+        snapshot = self._snapshot
+        return (snapshot is None
+                or snapshot.data_version != query_cache.data_version()
+                or snapshot.age() >= self.interval)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self._is_stale():
+                    self.refresh()
+            except Exception as e:
+                logger.warning("Aggregate refresh failed: %s", e)
+                with self._lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = str(e)
+            self._attempted.set()
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """Start the background thread (once)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="aggregate-refresher",
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self, timeout=FIRST_SNAPSHOT_TIMEOUT_S):
+        """Latest snapshot; the first call waits for the first refresh.
+
+        If the background refresh failed or is still running after
+        `timeout` seconds, the aggregates are computed in the caller.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        self.start()
+        self._attempted.wait(timeout)
+        return self._snapshot or self.refresh()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            snapshot = self._snapshot
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        stats["age_s"] = snapshot.age() if snapshot is not None else None
+        return stats
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_aggregate_refresher():
+    """The process-wide refresher, started on first use."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = AggregateRefresher()
+            _refresher.start()
+        return _refresher
+
+
+def aggregate_reader(name):
+    """Callable returning aggregate `name` from the latest snapshot on each call
+    (None if it has never been computed)."""
+    return lambda: get_aggregate_refresher().snapshot().get(name)
@@ -0,0 +1,110 @@
+"""
+bcrypt work factor calibrated to this machine.
+
+A fixed cost (bcrypt.gensalt() defaults to 12) is too slow on a small box
+and too cheap on a fast one. At start-up the cost is picked so that one
+verification takes about BCRYPT_TARGET_MS (default 250 ms):
+
+- a cheap probe hash (cost 8) is timed a few times and the fastest run
+  kept, since noise only ever makes a run slower;
+- each extra cost step doubles the work, so the probe time is scaled by
+  2 ** (cost - 8) and the highest cost that stays within the target wins;
+- the result is clamped to BCRYPT_MIN_COST..BCRYPT_MAX_COST (10..16), so a
+  fast measurement can never weaken hashes below the floor.
+
+BCRYPT_COST skips calibration and pins the cost (clamped to the same
+range). Calibration runs once per process, on first use;
+calibrate_in_background starts it on a daemon thread so start-up does not
+wait for it, and the first hash blocks only until it is done.
+
+Each bcrypt hash records its own cost ("$2b$12$..."), so hashes made at
+different costs verify side by side; hash_cost reads it back and
+needs_rehash tells login to upgrade a hash made below the calibrated
+cost. Hashes are never re-hashed downwards: the calibration is a noisy
+measurement repeated per process, and two processes that land one step
+apart would otherwise flip a user's hash between costs on every login.
+"""
+
+import re
+import threading
+import time
+from collections import namedtuple
+
+import bcrypt
+
+from app.config import get_env_optional
+
+TARGET_MS = float(get_env_optional("BCRYPT_TARGET_MS", "250"))
+MIN_COST = int(get_env_optional("BCRYPT_MIN_COST", "10"))
+MAX_COST = int(get_env_optional("BCRYPT_MAX_COST", "16"))
+FIXED_COST = get_env_optional("BCRYPT_COST", "")
+PROBE_COST = 8
+PROBE_SAMPLES = 3
+
+_COST_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+Calibration = namedtuple("Calibration", ["cost", "target_ms", "estimated_ms", "probe_ms", "seconds"])
+
+
+def hash_cost(password_hash):
+    """The cost encoded in a bcrypt hash string, or None if it is not one."""
+    match = _COST_RE.match(password_hash or "")
+    return int(match.group(1)) if match else None
+
+
+def _time_hash(cost):
+    started = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(cost))
+    return (time.perf_counter() - started) * 1000
+
+
+def calibrate(target_ms=TARGET_MS, min_cost=MIN_COST, max_cost=MAX_COST):
+    """Time bcrypt on this machine and pick the highest cost within `target_ms`.
+
+    Returns:
+        Calibration(cost, target_ms, estimated_ms at that cost, probe_ms, seconds spent)
+    """
+    started = time.perf_counter()
+    probe_ms = min(_time_hash(PROBE_COST) for _ in range(PROBE_SAMPLES))
+    cost = min_cost
+    for candidate in range(min_cost, max_cost + 1):
+        if probe_ms * 2 ** (candidate - PROBE_COST) <= target_ms:
+            cost = candidate
+    return Calibration(cost, target_ms, probe_ms * 2 ** (cost - PROBE_COST), probe_ms,
+                       time.perf_counter() - started)
+
+
+_calibration = None
+_lock = threading.Lock()
+
+
+def get_calibration():
+    """The process-wide Calibration, measured on first call (or pinned by BCRYPT_COST,
+    clamped to MIN_COST..MAX_COST)."""
+    global _calibration
+    if _calibration is None:
+        with _lock:
+            if _calibration is None:
+                if FIXED_COST:
+                    cost = min(max(int(FIXED_COST), MIN_COST), MAX_COST)
+                    _calibration = Calibration(cost, TARGET_MS, None, None, 0.0)
+                else:
+                    _calibration = calibrate()
+    return _calibration
+
+
+def calibrate_in_background():
+    """Start get_calibration on a daemon thread unless it has already run."""
+    if _calibration is None:
+        threading.Thread(target=get_calibration, name="bcrypt-calibration", daemon=True).start()
+
+
+def get_bcrypt_cost():
+    """The cost new hashes are made with."""
+    return get_calibration().cost
+
+
+def needs_rehash(password_hash):
+    """True if a bcrypt hash was made below the calibrated cost."""
+    cost = hash_cost(password_hash)
+    return cost is not None and cost < get_bcrypt_cost()
@@ -0,0 +1,97 @@
+"""
+Memoised Plotly Express figures for the dashboard charts.
+
+A figure is keyed on a hash of its input data, the chart kind and every
+option (px arguments, layout and trace updates). Flipping a page between
+Bar/Pie/Line therefore builds each figure once; afterwards, and whenever
+the counts are unchanged, the stored figure is handed to st.plotly_chart
+as is and plotly.express is not called at all.
+
+Figures are shared between sessions; callers must not modify them.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+FIGURE_CACHE_MAX_ENTRIES = 256
+
+
+def figure_key(kind, data, options):
+    """Stable hash of everything that determines a figure."""
+    payload = json.dumps([kind, data, options], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+    """LRU of built figures with hit/miss counters."""
+
+    def __init__(self, max_entries=FIGURE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._figures = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_build(self, key, build):
+        """Return the figure stored under `key`, calling `build()` on a miss."""
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                self._stats["hits"] += 1
+                return figure
+            self._stats["misses"] += 1
+
+        figure = build()
+        with self._lock:
+            self._figures[key] = figure
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+                self._stats["evictions"] += 1
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._figures)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+figure_cache = FigureCache()
+
+
+def cached_figure(kind, data, layout=None, traces=None, **options):
+    """Return a Plotly Express figure, building it only on a cache miss.
+
+    Args:
+        kind: "bar", "pie", "line" or "scatter".
+        data: Column dict (or other JSON-able data) passed to px as data_frame.
+        layout: Optional fig.update_layout() arguments.
+        traces: Optional fig.update_traces() arguments.
+        options: Keyword arguments for the px function (x, y, names, title...).
+    """
+    key = figure_key(kind, data, [options, layout, traces])
+
+    def build():
+        import plotly.express as px
+
+        fig = getattr(px, kind)(data, **options)
+        if traces:
+            fig.update_traces(**traces)
+        if layout:
+            fig.update_layout(**layout)
+        return fig
+
+    return figure_cache.get_or_build(key, build)
+
+
+def figure_cache_stats():
+    """Return hit/miss/eviction counters and hit_ratio of the figure cache."""
+    return figure_cache.stats()
@@ -0,0 +1,191 @@
+"""
+Sliding-window login throttle, checked before any bcrypt work.
+
+Every login attempt is counted against three keys. Over the last
+LOGIN_WINDOW_SECONDS a key may make at most:
+
+- LOGIN_MAX_ATTEMPTS_PER_USER attempts (default 5) for one username from
+  one client (IP address when known), which stops one client guessing an
+  account's password without letting it lock the real user out from
+  their own client;
+- LOGIN_MAX_ATTEMPTS_PER_ACCOUNT attempts (default 100) for one username
+  from all clients together, a looser cap on guessing spread over many
+  addresses;
+- LOGIN_MAX_ATTEMPTS_PER_CLIENT attempts (default 20) from one client,
+  which stops one client from spraying many accounts.
+
+An attempt over any limit is refused without a database lookup or a
+hash, so a credential-stuffing burst costs microseconds per attempt
+instead of a bcrypt check. Refused attempts are not recorded, so a
+throttled client cannot push an account's window further. A successful
+login clears its username-and-client window.
+
+Memory is bounded: keys whose attempts have all left the window are
+dropped, and at most LOGIN_THROTTLE_MAX_KEYS keys are tracked. When the
+limit is still exceeded after dropping expired keys, the least recently
+used client keys go first, then username-and-client keys. Account keys
+are only ever dropped once expired: if the table is full of live account
+windows, a new username's account window is not tracked, so rotating
+through usernames cannot push a targeted account's window out of memory.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+from app.config import get_env_optional
+
+WINDOW_S = float(get_env_optional("LOGIN_WINDOW_SECONDS", "300"))
+MAX_ATTEMPTS_PER_USER = int(get_env_optional("LOGIN_MAX_ATTEMPTS_PER_USER", "5"))
+MAX_ATTEMPTS_PER_ACCOUNT = int(get_env_optional("LOGIN_MAX_ATTEMPTS_PER_ACCOUNT", "100"))
+MAX_ATTEMPTS_PER_CLIENT = int(get_env_optional("LOGIN_MAX_ATTEMPTS_PER_CLIENT", "20"))
+MAX_KEYS = int(get_env_optional("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+
+# Key kinds evicted (least recently used first) when MAX_KEYS is exceeded, in order
+EVICTION_ORDER = ("client", "user")
+
+
+def _username(username):
+    return (username or "").strip().lower()
+
+
+class LoginThrottle:
+    """Per-username-and-client, per-username and per-client sliding windows of login attempts."""
+
+    def __init__(self, window=WINDOW_S, max_per_user=MAX_ATTEMPTS_PER_USER,
+                 max_per_account=MAX_ATTEMPTS_PER_ACCOUNT,
+                 max_per_client=MAX_ATTEMPTS_PER_CLIENT, max_keys=MAX_KEYS):
+        self.window = window
+        self.limits = {"user": max_per_user, "account": max_per_account, "client": max_per_client}
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # kind -> OrderedDict of key -> deque of attempt times, least recently used first
+        self._attempts = {kind: OrderedDict() for kind in ("user", "account", "client")}
+        self._stats = {"admitted": 0, "throttled": 0, "throttled_user": 0,
+                       "throttled_account": 0, "throttled_client": 0, "evicted": 0,
+                       "untracked": 0}
+
+    def _keys(self, username, client):
+        name = _username(username)
+        keys = [("user", (name, client)), ("account", name)]
+        if client:
+            keys.append(("client", client))
+        return keys
+
+    def _tracked(self):
+        return sum(len(keys) for keys in self._attempts.values())
+
+    def _window(self, kind, key, now):
+        """Attempt times of `key` still inside the window (or None). Caller holds the lock."""
+        attempts = self._attempts[kind]
+        times = attempts.get(key)
+        if times is None:
+            return None
+        while times and times[0] <= now - self.window:
+            times.popleft()
+        if not times:
+            del attempts[key]
+            return None
+        return times
+
+    def _drop_expired(self, now):
+        """Drop keys whose last attempt left the window. Caller holds the lock.
+
+        Keys are kept in order of their last attempt, so expired keys are
+        always at the front and this costs one check per dropped key.
+        """
+        for attempts in self._attempts.values():
+            while attempts:
+                key, times = next(iter(attempts.items()))
+                if times[-1] > now - self.window:
+                    break
+                del attempts[key]
+
+    def _evict(self, new_account=None):
+        """Get back under max_keys with LRU keys by EVICTION_ORDER. Caller holds the lock.
+
+        If only live account keys are left, `new_account` (the account key
+        this attempt just created) is dropped instead of an older one.
+        """
+        if self._tracked() <= self.max_keys:
+            return
+        for kind in EVICTION_ORDER:
+            attempts = self._attempts[kind]
+            while attempts and self._tracked() > self.max_keys:
+                attempts.popitem(last=False)
+                self._stats["evicted"] += 1
+        if self._tracked() > self.max_keys and new_account is not None:
+            self._attempts["account"].pop(new_account, None)
+            self._stats["untracked"] += 1
+
+    def admit(self, username, client=None):
+        """Record a login attempt if it is within the limits.
+
+        Returns:
+            tuple (admitted: bool, retry_after: seconds until the next
+            attempt would be admitted, 0 when admitted)
+        """
+        now = time.monotonic()
+        keys = self._keys(username, client)
+
+        with self._lock:
+            self._drop_expired(now)
+
+            retry_after = 0.0
+            for kind, key in keys:
+                times = self._window(kind, key, now)
+                if times is not None and len(times) >= self.limits[kind]:
+                    retry_after = max(retry_after, times[0] + self.window - now)
+                    self._stats[f"throttled_{kind}"] += 1
+            if retry_after:
+                self._stats["throttled"] += 1
+                return False, retry_after
+
+            new_account = None
+            for kind, key in keys:
+                attempts = self._attempts[kind]
+                times = attempts.get(key)
+                if times is None:
+                    times = attempts[key] = deque()
+                    if kind == "account":
+                        new_account = key
+                times.append(now)
+                attempts.move_to_end(key)
+            self._evict(new_account)
+            self._stats["admitted"] += 1
+            return True, 0.0
+
+    def reset(self, username, client=None):
+        """Forget a username's attempts from `client` (after a successful login)."""
+        with self._lock:
+            self._attempts["user"].pop((_username(username), client), None)
+
+    def clear(self):
+        with self._lock:
+            for attempts in self._attempts.values():
+                attempts.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["keys"] = self._tracked()
+        attempts = stats["admitted"] + stats["throttled"]
+        stats["throttled_ratio"] = stats["throttled"] / attempts if attempts else 0.0
+        return stats
+
+
+login_throttle = LoginThrottle()
+
+
+def admit_login(username, client=None):
+    """(admitted, retry_after) for a login attempt; see LoginThrottle.admit."""
+    return login_throttle.admit(username, client)
+
+
+def reset_login(username, client=None):
+    login_throttle.reset(username, client)
+
+
+def login_throttle_stats():
+    """Admitted/throttled counters and the number of tracked keys."""
+    return login_throttle.stats()
@@ -0,0 +1,143 @@
+"""
+Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (about BCRYPT_TARGET_MS per check, see
+bcrypt_cost). Run inline on each Streamlit script thread, a burst of logins puts every one
+of them on the CPU at once, so they all finish late together. Here at
+most PASSWORD_POOL_WORKERS hashes run at a time (default: one per CPU)
+and the rest wait in FIFO order, so early logins finish early.
+
+bcrypt releases the GIL while hashing, so a thread pool gets the same
+parallelism as a process pool without pickling or process start-up.
+
+Backpressure: at most PASSWORD_POOL_MAX_PENDING jobs may be queued or
+running. Further submissions wait up to PASSWORD_POOL_WAIT_SECONDS for a
+slot and then raise PasswordPoolBusyError, which callers report as "try
+again" instead of queueing without bound.
+
+The *_async functions return concurrent.futures.Future objects; in
+asyncio code use `await asyncio.wrap_future(future)`.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app.config import get_env_optional
+from app.services.bcrypt_cost import get_bcrypt_cost
+
+POOL_WORKERS = int(get_env_optional("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1)))
+POOL_MAX_PENDING = int(get_env_optional("PASSWORD_POOL_MAX_PENDING", "64"))
+POOL_WAIT_S = float(get_env_optional("PASSWORD_POOL_WAIT_SECONDS", "5"))
+
+
+class PasswordPoolBusyError(RuntimeError):
+    """Raised when the password pool stays full for longer than the wait timeout."""
+
+
+class PasswordPool:
+    """Thread pool for bcrypt with a bounded queue and latency counters."""
+
+    def __init__(self, workers=POOL_WORKERS, max_pending=POOL_MAX_PENDING, wait=POOL_WAIT_S):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait = wait
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "started": 0, "completed": 0, "rejected": 0,
+                       "max_queue_depth": 0, "wait_s": 0.0, "run_s": 0.0}
+
+    def submit(self, func, *args):
+        """Run func(*args) on the pool; returns a Future.
+
+        Raises:
+            PasswordPoolBusyError: No slot became free within `wait` seconds.
+        """
+        if not self._slots.acquire(timeout=self.wait):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise PasswordPoolBusyError(
+                f"Password pool busy: {self.max_pending} jobs pending for over {self.wait}s")
+
+        queued_at = time.perf_counter()
+        with self._lock:
+            self._stats["submitted"] += 1
+            depth = self._stats["submitted"] - self._stats["started"]
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._stats["started"] += 1
+                self._stats["wait_s"] += started - queued_at
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._stats["completed"] += 1
+                    self._stats["run_s"] += time.perf_counter() - started
+                self._slots.release()
+
+        try:
+            return self._executor.submit(job)
+        except RuntimeError:
+            self._slots.release()
+            raise
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = stats["submitted"] - stats["started"]
+        stats["in_flight"] = stats["started"] - stats["completed"]
+        wait_s, run_s = stats.pop("wait_s"), stats.pop("run_s")
+        stats["avg_wait_ms"] = wait_s / stats["started"] * 1000 if stats["started"] else 0.0
+        stats["avg_run_ms"] = run_s / stats["completed"] * 1000 if stats["completed"] else 0.0
+        stats["workers"] = self.workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+password_pool = PasswordPool()
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(password, password_hash):
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def hash_password_async(password, rounds=None):
+    """Future resolving to the bcrypt hash (str) of `password`.
+
+    `rounds` defaults to the calibrated cost (see bcrypt_cost).
+    """
+    return password_pool.submit(_hash, password, rounds or get_bcrypt_cost())
+
+
+def check_password_async(password, password_hash):
+    """Future resolving to True if `password` matches `password_hash`."""
+    return password_pool.submit(_check, password, password_hash)
+
+
+def hash_password(password, rounds=None):
+    """Hash `password` on the pool and wait for the result."""
+    return hash_password_async(password, rounds).result()
+
+
+def check_password(password, password_hash):
+    """Verify `password` on the pool and wait for the result."""
+    return check_password_async(password, password_hash).result()
+
+
+def password_pool_stats():
+    """Queue depth, rejections and average wait/run times of the password pool."""
+    return password_pool.stats()
@@ -0,0 +1,299 @@
+"""
+Server-side login sessions with signed, expiring tokens.
+
+A successful login (bcrypt, once) issues a token:
+
+    base64url({"sid": session id, "u": username, "exp": unix time}) . base64url(HMAC-SHA256)
+
+The session itself is a row in user_sessions, tied to the users table, so
+it can be revoked (logout) and the role is always read from users.
+`verify_session` checks a token in three steps, cheapest first:
+
+1. the in-memory verification cache: a token verified in the last
+   VERIFY_CACHE_TTL_S seconds is accepted with a dict lookup;
+2. the HMAC signature and expiry, without touching the database, so
+   forged or expired tokens never reach SQLite;
+3. the user_sessions row (not revoked, not expired) joined to users.
+
+The signing key is SESSION_SECRET from .env. Without it a random key is
+generated once and kept in DATA/.session_secret (owner-only permissions),
+so tokens survive restarts and every worker process signs with the same
+key. A revocation made by another process is seen once the cached entry
+expires.
+
+Expired and revoked rows are deleted by `issue`, at most once every
+SESSION_PURGE_INTERVAL_MINUTES (default 15), so user_sessions does not
+grow with every login. The store, and with it the key file, is created
+on first use rather than at import.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from app.config import get_env_optional
+from app.data.db import pooled_connection, DATA_DIR
+from app.data.schema import create_users_table, create_user_sessions_table
+
+SESSION_TTL_S = int(get_env_optional("SESSION_TTL_MINUTES", "480")) * 60
+VERIFY_CACHE_TTL_S = 30.0
+VERIFY_CACHE_MAX_ENTRIES = 4096
+PURGE_INTERVAL_S = float(get_env_optional("SESSION_PURGE_INTERVAL_MINUTES", "15")) * 60
+SECRET_FILE = DATA_DIR / ".session_secret"
+
+SessionInfo = namedtuple("SessionInfo", ["session_id", "username", "role", "expires_at", "token"])
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def load_session_secret(path=SECRET_FILE):
+    """SESSION_SECRET if set, else the key persisted in `path` (created on first use).
+
+    The key is written to a temporary file and hard-linked into place, so
+    when several processes start at once exactly one key wins and the
+    others read it.
+    """
+    secret = get_env_optional("SESSION_SECRET")
+    if secret:
+        return secret
+
+    path = Path(path)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".session_secret.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            os.chmod(tmp, 0o600)
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(tmp)
+    return path.read_text().strip()
+
+
+class SessionStore:
+    """Issues, verifies and revokes session tokens; caches verifications."""
+
+    def __init__(self, secret=None, ttl=SESSION_TTL_S, cache_ttl=VERIFY_CACHE_TTL_S,
+                 max_entries=VERIFY_CACHE_MAX_ENTRIES, purge_interval=PURGE_INTERVAL_S):
+        if secret is None:
+            secret = load_session_secret()
+        self._secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+        self.ttl = ttl
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0  # monotonic time; the first issue purges
+        self._lock = threading.Lock()
+        self._verified = OrderedDict()  # token -> (SessionInfo, verified at)
+        self._tables_ready = False
+        self._stats = {"issued": 0, "cache_hits": 0, "db_checks": 0,
+                       "rejected": 0, "revoked": 0, "purged": 0}
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self._secret, payload, hashlib.sha256).digest())
+
+    def _ensure_tables(self, conn):
+        if not self._tables_ready:
+            create_users_table(conn)
+            create_user_sessions_table(conn)
+            self._tables_ready = True
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def issue(self, username):
+        """Create a session for an existing user and return its token (None if no such user)."""
+        now = int(time.time())
+        session_id = secrets.token_urlsafe(16)
+        expires_at = now + self.ttl
+
+        with pooled_connection() as conn:
+            self._ensure_tables(conn)
+            row = conn.execute("SELECT role FROM users WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "INSERT INTO user_sessions (session_id, username, issued_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (session_id, username, now, expires_at),
+            )
+            conn.commit()
+
+        payload = json.dumps({"sid": session_id, "u": username, "exp": expires_at},
+                             separators=(",", ":")).encode("utf-8")
+        token = f"{_b64encode(payload)}.{self._sign(payload)}"
+        with self._lock:
+            self._stats["issued"] += 1
+            self._remember(token, SessionInfo(session_id, username, row[0], expires_at, token))
+        self._purge_if_due()
+        return token
+
+    def _purge_if_due(self):
+        """Run purge_expired if purge_interval has passed since the last run."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        self.purge_expired()
+
+    def _remember(self, token, info):
+        """Cache a verified token; caller holds the lock."""
+        self._verified[token] = (info, time.monotonic())
+        self._verified.move_to_end(token)
+        while len(self._verified) > self.max_entries:
+            self._verified.popitem(last=False)
+
+    def _decode(self, token):
+        """Payload of a well-signed, unexpired token, else None."""
+        try:
+            encoded, signature = token.split(".")
+            payload = _b64decode(encoded)
+        except (AttributeError, ValueError):
+            return None
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        try:
+            claims = json.loads(payload)
+        except ValueError:
+            return None
+        if claims.get("exp", 0) <= time.time():
+            return None
+        return claims
+
+    def verify(self, token):
+        """Return the SessionInfo of a valid token, or None."""
+        if not token:
+            return None
+
+        with self._lock:
+            cached = self._verified.get(token)
+            if cached is not None:
+                info, verified_at = cached
+                if time.monotonic() - verified_at < self.cache_ttl and info.expires_at > time.time():
+                    self._verified.move_to_end(token)
+                    self._stats["cache_hits"] += 1
+                    return info
+                del self._verified[token]
+
+        claims = self._decode(token)
+        if claims is None:
+            self._count("rejected")
+            return None
+
+        self._count("db_checks")
+        with pooled_connection() as conn:
+            self._ensure_tables(conn)
+            row = conn.execute(
+                """
+                SELECT u.role, s.expires_at FROM user_sessions s
+                JOIN users u ON u.username = s.username
+                WHERE s.session_id = ? AND s.username = ? AND s.revoked = 0 AND s.expires_at > ?
+                """,
+                (claims["sid"], claims["u"], int(time.time())),
+            ).fetchone()
+        if row is None:
+            self._count("rejected")
+            return None
+
+        info = SessionInfo(claims["sid"], claims["u"], row[0], row[1], token)
+        with self._lock:
+            self._remember(token, info)
+        return info
+
+    def revoke(self, token):
+        """End the session of `token` (logout). Returns True if one was revoked."""
+        claims = self._decode(token) if token else None
+        with self._lock:
+            self._verified.pop(token, None)
+        if claims is None:
+            return False
+
+        with pooled_connection() as conn:
+            self._ensure_tables(conn)
+            cursor = conn.execute(
+                "UPDATE user_sessions SET revoked = 1 WHERE session_id = ? AND revoked = 0",
+                (claims["sid"],),
+            )
+            conn.commit()
+        if cursor.rowcount:
+            self._count("revoked")
+        return cursor.rowcount > 0
+
+    def purge_expired(self):
+        """Delete expired and revoked sessions; returns how many were removed."""
+        with pooled_connection() as conn:
+            self._ensure_tables(conn)
+            cursor = conn.execute(
+                "DELETE FROM user_sessions WHERE expires_at <= ? OR revoked = 1",
+                (int(time.time()),),
+            )
+            conn.commit()
+        with self._lock:
+            self._stats["purged"] += cursor.rowcount
+        return cursor.rowcount
+
+    def clear_cache(self):
+        with self._lock:
+            self._verified.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached"] = len(self._verified)
+        checks = stats["cache_hits"] + stats["db_checks"]
+        stats["hit_ratio"] = stats["cache_hits"] / checks if checks else 0.0
+        return stats
+
+
+_session_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """The process-wide SessionStore, created (and its key loaded) on first call."""
+    global _session_store
+    if _session_store is None:
+        with _store_lock:
+            if _session_store is None:
+                _session_store = SessionStore()
+    return _session_store
+
+
+def issue_session(username):
+    """Start a session for `username` (already authenticated) and return its token."""
+    return get_session_store().issue(username)
+
+
+def verify_session(token):
+    """SessionInfo for a valid token, or None."""
+    return get_session_store().verify(token)
+
+
+def revoke_session(token):
+    """Log the session of `token` out."""
+    return get_session_store().revoke(token)
+
+
+def session_stats():
+    """Issue/verify/cache counters of the session store."""
+    return get_session_store().stats()
@@ -1,9 +1,15 @@
-import bcrypt
-import sqlite3
+import math
+import time
+from collections import namedtuple
 from pathlib import Path
-from app.data.db import connect_database
-from app.data.users import get_user_by_username, insert_user
+from app.data.db import connect_database, pooled_connection
+from app.data.bulk import bulk_insert, DEFAULT_CHUNK_SIZE
+from app.data.users import get_user_by_username, insert_user, get_password_cost_counts
 from app.data.schema import create_users_table
+from app.services.password_pool import (hash_password, hash_password_async, check_password,
+                                        PasswordPoolBusyError)
+from app.services.bcrypt_cost import get_bcrypt_cost, needs_rehash
+from app.services.login_throttle import admit_login, reset_login
 
 
 DATA_DIR = Path("DATA")
@@ -25,56 +31,61 @@ def register_user(username, password, role='user'):
     if not username or not password:
         return False, "Username and password are required."
    
-    conn = connect_database()
-    cursor = conn.cursor()
-
-    # Ensure user table exists
-    create_users_table(conn)
-
-    # Check if username already exists
-    cursor.execute("SELECT 1 FROM users WHERE username = ?", (username,))
-    if cursor.fetchone():
-        conn.close()
-        return False, f"Username '{username}' is already taken."
-    
-    # Hash the password
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-    password_hash_str = password_hash.decode('utf-8')
-
-    # Insert new user
-    cursor.execute(
-        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-        (username, password_hash_str, role)
-    )
-    conn.commit()
-    conn.close()
+    # Check if username already exists, before paying for a hash
+    with pooled_connection() as conn:
+        create_users_table(conn)
+        if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+            return False, f"Username '{username}' is already taken."
+
+    # Hash the password (on the bcrypt worker pool) without holding a
+    # database connection through the queue wait and the hash
+    try:
+        password_hash_str = hash_password(password)
+    except PasswordPoolBusyError:
+        return False, "Too many requests right now. Please try again in a moment."
+
+    with pooled_connection() as conn:
+        # Insert new user; INSERT OR IGNORE so a concurrent registration of
+        # the same name is reported instead of raising
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            (username, password_hash_str, role)
+        )
+        conn.commit()
+        if cursor.rowcount == 0:
+            return False, f"Username '{username}' is already taken."
 
     return True, f"User '{username}' registered successfully with role '{role}'."
 
 
 
 
-def login_user(username, password):
+def login_user(username, password, client=None):
     """
     Authenticate a user against the database.
 
     Args:
         username: User's login name
         password: Plain text password to verify
+        client: Optional client identifier (e.g. IP address) for throttling
 
     Returns:
         tuples (success: bool, message: str)
     """
-    conn = connect_database()
-    cursor = conn.cursor()
+    # Refuse attempts over the limit before any lookup or hashing
+    admitted, retry_after = admit_login(username, client)
+    if not admitted:
+        return False, f"Too many login attempts. Try again in {math.ceil(retry_after)} seconds."
 
-    # Look up user 
-    cursor.execute(
-        "SELECT password_hash, role FROM users WHERE username = ?",
-        (username,)
-    )
-    row = cursor.fetchone()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        # Look up user 
+        cursor.execute(
+            "SELECT password_hash, role FROM users WHERE username = ?",
+            (username,)
+        )
+        row = cursor.fetchone()
 
     # User not found
     if row is None:
@@ -82,12 +93,137 @@ def login_user(username, password):
 
     stored_hash, role = row
 
-    # Verify password
-    if bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
+    # Verify password (on the bcrypt worker pool)
+    try:
+        matches = check_password(password, stored_hash)
+    except PasswordPoolBusyError:
+        return False, "Too many logins right now. Please try again in a moment."
+
+    if matches:
+        reset_login(username, client)
+        if needs_rehash(stored_hash):
+            _rehash_in_background(username, password, stored_hash)
         return True, f"Login successful! Welcome, {username} (role: {role})."
     else:
         return False, "Incorrect password."
-    
+
+
+def _rehash_in_background(username, password, stored_hash):
+    """
+    Re-hash a just-verified password at the calibrated cost without making
+    the login wait for it. The UPDATE only applies if the stored hash is
+    still the one that was verified, so a concurrent password change wins.
+    """
+    def _store(future):
+        if future.exception() is not None:
+            return
+        with pooled_connection() as conn:
+            conn.execute(
+                "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+                (future.result(), username, stored_hash)
+            )
+            conn.commit()
+
+    try:
+        hash_password_async(password).add_done_callback(_store)
+    except PasswordPoolBusyError:
+        pass  # pool is saturated; the next login will try again
+
+
+def password_cost_report():
+    """
+    bcrypt cost distribution across users.
+
+    Returns:
+        dict with target_cost (the calibrated cost), costs ({cost: users},
+        None for non-bcrypt hashes) and below_target (users hashed under the
+        target, who will be re-hashed at their next login)
+    """
+    target = get_bcrypt_cost()
+    costs = get_password_cost_counts()
+    below_target = sum(n for cost, n in costs.items() if cost is not None and cost < target)
+    return {"target_cost": target, "costs": costs, "below_target": below_target}
+
+
+UserMigrationSummary = namedtuple(
+    "UserMigrationSummary", ["inserted", "skipped", "malformed", "seconds", "rows_per_sec"])
+
+
+def _parse_user_lines(lines, counts):
+    """Yield (username, password_hash, role) from users.txt lines.
+
+    Blank lines, comments and a header row are ignored. Lines without a
+    username and a bcrypt hash are counted in counts["malformed"].
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        parts = line.split(",", 3)
+        if len(parts) < 2:
+            counts["malformed"] += 1
+            continue
+        username, password_hash = parts[0].strip(), parts[1].strip()
+        if username == "username" and password_hash == "password_hash":
+            continue
+        if not username or not password_hash.startswith("$2"):
+            counts["malformed"] += 1
+            continue
+
+        counts["parsed"] += 1
+        role = parts[2].strip() if len(parts) >= 3 else ""
+        yield username, password_hash, role or "user"
+
+
+def bulk_migrate_users(conn=None, file_path=DATA_DIR / "users.txt",
+                       chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Stream users.txt into the users table in one transaction.
+
+    Lines are read lazily and inserted with INSERT OR IGNORE in chunks of
+    `chunk_size`, so memory stays constant however large the file is.
+    Usernames already in the table (or repeated in the file) are skipped.
+
+    Args:
+        conn: Database connection (default: a bulk-ingest connection)
+        file_path: Path to the users file
+        chunk_size: Rows per executemany call
+        progress: Optional callback(rows inserted so far)
+
+    Returns:
+        UserMigrationSummary(inserted, skipped, malformed, seconds, rows_per_sec),
+        or None if the file does not exist.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        return None
+
+    created_conn = False
+    if conn is None:
+        conn = connect_database(profile="bulk-ingest")
+        created_conn = True
+
+    counts = {"parsed": 0, "malformed": 0}
+    started = time.perf_counter()
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            result = bulk_insert(conn, "users", ["username", "password_hash", "role"],
+                                 _parse_user_lines(f, counts), chunk_size=chunk_size,
+                                 on_conflict="ignore", progress=progress)
+    finally:
+        if created_conn:
+            conn.close()
+
+    seconds = time.perf_counter() - started
+    lines = counts["parsed"] + counts["malformed"]
+    return UserMigrationSummary(
+        inserted=result.inserted,
+        skipped=counts["parsed"] - result.inserted,
+        malformed=counts["malformed"],
+        seconds=seconds,
+        rows_per_sec=lines / seconds if seconds else 0.0,
+    )
 
 
 def migrate_users_from_file(conn=None, file_path=DATA_DIR / "users.txt"):
@@ -101,51 +237,11 @@ def migrate_users_from_file(conn=None, file_path=DATA_DIR / "users.txt"):
     Returns:
         int: Number of users migrated
     """
-    path = Path(file_path)
-
-    # Check if file exists
-    if not path.exists():
+    summary = bulk_migrate_users(conn, file_path)
+    if summary is None:
         print(f"Warning: {file_path} not found. skipping migration.")
         return 0
-    
-    created_conn = False
-    if conn is None:
-        conn = connect_database()
-        created_conn = True
-    cursor = conn.cursor()
-    migrated_count = 0
-
-    # Read the file line by line
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-
-            # Skip empty lines and comments
-            if not line or line.startswith("#"):
-                continue
-
-            # Parse the line
-            parts = [p.strip() for p in line.split(",")]
-            if len(parts) < 2:
-                continue
-
-            username = parts[0]
-            password_hash = parts[1]
-            role = parts[2] if len(parts) >= 3 else "user"
-
-            # Insert into database using parameterized query
-            try:
-                cursor.execute(
-                    "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                    (username, password_hash, role)
-                )
-                migrated_count += 1
-            except sqlite3.IntegrityError:
-                # User already exists 
-                print(f"User '{username}' already exists. Skipping.")
-
-    conn.commit()
-    if created_conn:
-        conn.close()
-    return migrated_count
-    
\ No newline at end of file
+
+    print(f"Users: {summary.inserted} inserted, {summary.skipped} already present, "
+          f"{summary.malformed} malformed ({summary.rows_per_sec:,.0f} lines/s)")
+    return summary.inserted
@@ -0,0 +1,66 @@
+"""
+Page guard and logout backed by the session store.
+
+The login token lives only in st.session_state, on the server; it is
+never put in the URL, where it would leak through browser history, logs,
+shared links and Referer headers. Streamlit keeps session_state across
+page switches and websocket reconnects, so navigation stays logged in; a
+full browser reload starts a new Streamlit session and asks for the
+password again. Every page run verifies the token, which after the first
+check is a lookup in the session store's verification cache. The
+logged_in / username / role session flags are set from the verified
+session and are not trusted on their own.
+"""
+
+import streamlit as st
+
+from app.services.session_store import issue_session, verify_session, revoke_session
+
+TOKEN_KEY = "session_token"
+
+
+def client_address():
+    """The browser's IP address when Streamlit exposes it (st.context, 1.45+), else None."""
+    context = getattr(st, "context", None)
+    return getattr(context, "ip_address", None)
+
+
+def _clear_flags():
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+    st.session_state.role = "user"
+    st.session_state.pop(TOKEN_KEY, None)
+
+
+def start_session(username):
+    """Issue a token for `username` (just authenticated) and log this session in."""
+    token = issue_session(username)
+    if token is None:
+        return None
+    st.session_state[TOKEN_KEY] = token
+    return restore_session()
+
+
+def restore_session():
+    """Verify this browser session's token and set the login flags.
+
+    Returns:
+        SessionInfo, or None if there is no valid session (flags cleared).
+    """
+    session = verify_session(st.session_state.get(TOKEN_KEY))
+    if session is None:
+        _clear_flags()
+        return None
+
+    st.session_state.logged_in = True
+    st.session_state.username = session.username
+    st.session_state.role = session.role or "user"
+    return session
+
+
+def logout():
+    """Revoke this session's token and clear the login flags."""
+    token = st.session_state.get(TOKEN_KEY)
+    if token:
+        revoke_session(token)
+    _clear_flags()
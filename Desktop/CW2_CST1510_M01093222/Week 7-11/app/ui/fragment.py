@@ -0,0 +1,32 @@
+"""
+`fragment`: Streamlit's partial-rerun decorator, with a fallback.
+
+A function decorated with st.fragment reruns on its own when a widget
+inside it changes, instead of re-executing the whole page script.
+requirements.txt asks for Streamlit 1.37+, where st.fragment is stable.
+On an older install st.experimental_fragment (1.33-1.36) is used, and
+before that the function simply runs as part of the page; both fallbacks
+log a warning, since every toggle then reruns more than its own panel.
+"""
+
+import logging
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+
+def _plain(func):
+    return func
+
+
+fragment = getattr(st, "fragment", None)
+if fragment is None:
+    fragment = getattr(st, "experimental_fragment", None)
+    if fragment is not None:
+        logger.warning("Streamlit %s has no st.fragment; using st.experimental_fragment. "
+                       "Upgrade to 1.37+.", st.__version__)
+    else:
+        fragment = _plain
+        logger.warning("Streamlit %s has no fragments; chart panels will rerun the whole page. "
+                       "Upgrade to 1.37+.", st.__version__)
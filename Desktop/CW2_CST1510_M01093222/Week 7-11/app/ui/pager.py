@@ -0,0 +1,62 @@
+"""
+Page-through controls for the keyset-paginated readers in app/data.
+
+The cursor of every page visited is kept in st.session_state, so
+"Previous" is a pop and "Next" a push; no page ever re-reads the rows
+before it.
+"""
+
+import streamlit as st
+
+
+def _reset(key, signature):
+    st.session_state[f"{key}_cursors"] = [None]
+    st.session_state[f"{key}_signature"] = signature
+
+
+def _next(key, cursor):
+    st.session_state[f"{key}_cursors"].append(cursor)
+
+
+def _previous(key):
+    if len(st.session_state[f"{key}_cursors"]) > 1:
+        st.session_state[f"{key}_cursors"].pop()
+
+
+def paged_dataframe(key, fetch_page, page_size=50, filters=None, columns=None, **dataframe_kwargs):
+    """Show one page from `fetch_page` with Previous/Next buttons.
+
+    Args:
+        key: Unique widget/session key for this table.
+        fetch_page: A reader such as get_incidents_page.
+        page_size: Rows per page.
+        filters: {column: value} passed to the reader; changing them restarts at page 1.
+        columns: Optional column projection passed to the reader.
+        dataframe_kwargs: Extra arguments for st.dataframe.
+
+    Returns:
+        The DataFrame of the current page.
+    """
+    signature = repr((sorted((filters or {}).items()), columns, page_size))
+    if st.session_state.get(f"{key}_signature") != signature:
+        _reset(key, signature)
+
+    cursors = st.session_state[f"{key}_cursors"]
+    page, next_cursor = fetch_page(before_id=cursors[-1], limit=page_size,
+                                   filters=filters, columns=columns)
+
+    dataframe_kwargs.setdefault("use_container_width", True)
+    dataframe_kwargs.setdefault("hide_index", True)
+    st.dataframe(page, **dataframe_kwargs)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("← Previous", key=f"{key}_prev", disabled=len(cursors) == 1,
+                  on_click=_previous, args=(key,), use_container_width=True)
+    with col2:
+        st.caption(f"Page {len(cursors)} · {len(page)} rows")
+    with col3:
+        st.button("Next →", key=f"{key}_next", disabled=next_cursor is None,
+                  on_click=_next, args=(key, next_cursor), use_container_width=True)
+
+    return page
@@ -0,0 +1,38 @@
+"""
+Searchable record picker for tables too large to list in a selectbox.
+
+The selectbox only ever holds the few options matching what the user has
+typed (the newest records when the box is empty), fetched from an indexed
+reader such as get_incident_options. The selection is the record's id, so
+the caller looks the record up by primary key instead of filtering a
+DataFrame.
+"""
+
+import streamlit as st
+
+
+def record_picker(key, label, load_options, limit=50,
+                  placeholder="Type a title or an id"):
+    """Search box plus a selectbox of matching records.
+
+    Args:
+        key: Unique widget/session key for this picker.
+        label: Selectbox label.
+        load_options: load_options(query, limit) -> [(id, title), ...].
+        limit: Most options shown at once.
+        placeholder: Hint shown in the search box.
+
+    Returns:
+        The selected id, or None if nothing matches.
+    """
+    query = st.text_input(f"🔎 {label}", key=f"{key}_query", placeholder=placeholder)
+    options = load_options(query, limit)
+    if not options:
+        st.caption("No matching records")
+        return None
+
+    titles = dict(options)
+    if len(options) == limit:
+        st.caption(f"Showing the first {limit} matches; type more to narrow down")
+    return st.selectbox(label, list(titles), key=f"{key}_select",
+                        format_func=lambda record_id: f"{record_id}: {titles[record_id]}")
@@ -0,0 +1,47 @@
+"""
+Per-rerun data snapshot shared by every section of a page.
+
+Streamlit re-executes the page script on each interaction. A page creates
+one RerunSnapshot at the start of the run and passes it to its sections;
+each dataset is then loaded on first use and reused for the rest of that
+run, however many sections read it. The next rerun creates a fresh
+snapshot, so data is never older than the current interaction.
+
+Set DEBUG_SNAPSHOT=1 to show how many loads each rerun performed.
+"""
+
+import streamlit as st
+
+from app.config import get_env_optional
+
+DEBUG_SNAPSHOT = get_env_optional("DEBUG_SNAPSHOT", "0") == "1"
+
+
+class RerunSnapshot:
+    """Loads each named dataset at most once per script run."""
+
+    def __init__(self, key):
+        self.key = key
+        self._data = {}
+        self.loads = {}  # name -> loader calls during this run
+        # Rerun counter kept across runs, for the debug caption
+        runs_key = f"{key}_snapshot_runs"
+        st.session_state[runs_key] = st.session_state.get(runs_key, 0) + 1
+        self.run = st.session_state[runs_key]
+
+    def get(self, name, loader, *args, **kwargs):
+        """Return dataset `name`, calling `loader(*args, **kwargs)` only the first time."""
+        if name not in self._data:
+            self._data[name] = loader(*args, **kwargs)
+            self.loads[name] = self.loads.get(name, 0) + 1
+        return self._data[name]
+
+    def total_loads(self):
+        return sum(self.loads.values())
+
+    def debug_caption(self):
+        """Show the per-run load counts when DEBUG_SNAPSHOT is on."""
+        if not DEBUG_SNAPSHOT:
+            return
+        loads = ", ".join(f"{name}={count}" for name, count in self.loads.items()) or "none"
+        st.caption(f"🐞 {self.key} rerun {self.run}: {self.total_loads()} load(s) ({loads})")
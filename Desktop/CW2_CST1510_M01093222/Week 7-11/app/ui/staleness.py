@@ -0,0 +1,34 @@
+"""
+Caption saying how old a shared AggregateSnapshot is.
+
+Figures come from the background aggregate refresher, so they may lag a
+write by up to its poll interval (or more if refreshes are failing). The
+caption turns into a warning once the snapshot is older than twice the
+refresh interval, and aggregates whose last refresh failed are named.
+"""
+
+import time
+
+import streamlit as st
+
+
+def _ago(seconds):
+    if seconds < 60:
+        return f"{seconds:.0f}s ago"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min ago"
+    return f"{seconds / 3600:.1f} h ago"
+
+
+def staleness_caption(snapshot, refresh_interval):
+    """Show when `snapshot` was computed; warn if it is overdue."""
+    age = snapshot.age()
+    computed = time.strftime("%H:%M:%S", time.localtime(snapshot.computed_at))
+    text = f"Figures as of {computed} ({_ago(age)}, computed in {snapshot.duration_ms:.0f} ms)"
+    if age > 2 * refresh_interval:
+        st.warning(f"⚠️ {text}; background refresh is behind")
+    else:
+        st.caption(f"🕒 {text}")
+    if snapshot.errors:
+        st.warning(f"⚠️ Could not refresh: {', '.join(snapshot.errors)}; "
+                   "showing their last known figures where available")
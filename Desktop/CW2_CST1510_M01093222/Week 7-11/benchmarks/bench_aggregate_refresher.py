@@ -0,0 +1,102 @@
+"""
+N sessions opening the dashboards right after a write: every session
+running the aggregate readers itself (through the query cache) against one
+background refresh shared through AggregateSnapshot.
+
+Run from the project folder:
+    python benchmarks/bench_aggregate_refresher.py --rows 200000 --sessions 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.data.db as db
+from app.data.cache import query_cache
+from app.data.schema import create_all_tables, create_users_data_table
+from app.data.bulk import bulk_insert
+from app.data.incidents import insert_incident
+from app.services.aggregate_refresher import AGGREGATES, AggregateRefresher
+
+
+def seed(conn, rows):
+    rng = random.Random(1)
+    levels = ["Low", "Medium", "High", "Critical"]
+    statuses = ["Open", "In Progress", "Resolved", "Closed"]
+    bulk_insert(conn, "cyber_incidents", ["title", "severity", "status", "date"],
+                ((f"Incident type {rng.randint(1, 50)}", rng.choice(levels), rng.choice(statuses),
+                  f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}") for _ in range(rows)))
+    bulk_insert(conn, "it_tickets", ["title", "priority", "status", "created_date"],
+                ((f"Ticket {i}", rng.choice(levels), rng.choice(statuses), "2024-06-01")
+                 for i in range(rows)))
+    bulk_insert(conn, "datasets_metadata", ["name", "source", "category", "size"],
+                ((f"dataset_{i}", rng.choice(["Internal", "Kaggle"]), rng.choice(["HR", "IT"]), i)
+                 for i in range(rows)))
+
+
+def sessions(n, work):
+    """Run `work` in n threads at once; return wall time in ms."""
+    barrier = threading.Barrier(n)
+
+    def session():
+        barrier.wait()
+        work()
+
+    threads = [threading.Thread(target=session) for _ in range(n)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        query_cache.db_path = db.DB_PATH
+        conn = db.connect_database(profile="bulk-ingest")
+        create_all_tables(conn)
+        create_users_data_table(conn)
+        seed(conn, args.rows)
+        conn.close()
+
+        print(f"{args.rows:,} rows per table, {args.sessions} sessions after one write")
+
+        insert_incident("new", "High", "Open", "2024-12-01")
+        misses = query_cache.stats()["misses"]
+        ms = sessions(args.sessions, lambda: [reader() for reader in AGGREGATES.values()])
+        scans = query_cache.stats()["misses"] - misses
+        print(f"{'per-session readers':<24}{ms:>9.1f} ms {scans:>5} aggregate queries")
+
+        refresher = AggregateRefresher()
+        refresher.refresh()
+        insert_incident("newer", "High", "Open", "2024-12-01")
+        started = time.perf_counter()
+        refresher.refresh()
+        refresh_ms = (time.perf_counter() - started) * 1000
+        ms = sessions(args.sessions, lambda: [refresher.snapshot()[name] for name in AGGREGATES])
+        print(f"{'shared snapshot':<24}{ms:>9.1f} ms {len(AGGREGATES):>5} aggregate queries "
+              f"(one background refresh, {refresh_ms:.1f} ms)")
+
+        db.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+End-to-end chart toggle latency on pages/4_Analytics.py, via Streamlit's AppTest.
+
+Fills a temporary database, loads the page once as a logged-in user, then
+clicks the Role Distribution Pie/Bar toggle repeatedly and reports how long
+each click takes to produce the updated page. Pass --page to time another
+version of the page, e.g. the one before chart panels became fragments:
+
+    git show <commit>:"Week 7-11/pages/4_Analytics.py" > /tmp/analytics_old.py
+    python benchmarks/bench_analytics_toggle.py --page /tmp/analytics_old.py
+
+Run from the project folder:
+    python benchmarks/bench_analytics_toggle.py --rows 200000 --clicks 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+import app.data.db as db
+from app.data.cache import query_cache
+from app.data.schema import create_all_tables, create_users_data_table
+from app.data.incidents import insert_incidents_bulk
+from app.data.tickets import insert_tickets_bulk
+from app.data.bulk import bulk_insert
+from app.data.users import insert_user
+from app.services.session_store import issue_session
+
+
+def fill_database(conn, rows):
+    rng = random.Random(1)
+    insert_incidents_bulk(
+        ((f"{rng.choice(['Phishing', 'Malware', 'DDoS', 'Data Breach'])}",
+          rng.choice(["Low", "Medium", "High", "Critical"]),
+          rng.choice(["Open", "In Progress", "Resolved"]), "2024-11-25")
+         for _ in range(rows)), conn=conn)
+    insert_tickets_bulk(
+        (f"Ticket #{i}", rng.choice(["low", "medium", "high"]),
+         rng.choice(["open", "closed"]), "2024-11-25")
+        for i in range(rows))
+    create_users_data_table(conn)
+    bulk_insert(conn, "users_data", ["username", "password_hash", "role"],
+                ((f"user{i}", "x", rng.choice(["admin", "analyst", "user"]))
+                 for i in range(rows // 10)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--clicks", type=int, default=20)
+    parser.add_argument("--page", default=os.path.join(ROOT, "pages", "4_Analytics.py"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app (pools and query cache) at the scratch database
+        db.DB_PATH = Path(tmp) / "bench.db"
+        query_cache.db_path = db.DB_PATH
+
+        conn = db.connect_database()
+        create_all_tables(conn)
+        fill_database(conn, args.rows)
+        conn.close()
+        insert_user("bench", "x", "admin")
+
+        at = AppTest.from_file(args.page, default_timeout=120)
+        at.session_state.session_token = issue_session("bench")
+
+        started = time.perf_counter()
+        at.run()
+        first_ms = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise SystemExit(f"page raised: {at.exception[0].message}")
+
+        timings = []
+        for i in range(args.clicks):
+            key = "user_bar" if i % 2 == 0 else "user_pie"
+            started = time.perf_counter()
+            at.button(key=key).click().run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        db.close_all_pools()
+
+    timings.sort()
+    print(f"page      : {args.page}")
+    print(f"rows      : {args.rows:,}")
+    print(f"first run : {first_ms:8.1f} ms")
+    print(f"toggle    : median {statistics.median(timings):.1f} ms, "
+          f"p90 {timings[int(len(timings) * 0.9) - 1]:.1f} ms, max {timings[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+bcrypt cost calibration and rehash-on-login.
+
+First calibrates for a few target times and checks the estimate against
+a measured verification at the chosen cost. Then seeds users hashed at a
+stale cost, logs each of them in once and reports login latency and the
+cost distribution before and after the background re-hashes.
+
+Run from the project folder:
+    python benchmarks/bench_bcrypt_cost.py --users 20 --old-cost 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bcrypt
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.data.db as db
+import app.services.bcrypt_cost as bcrypt_cost
+from app.data.cache import query_cache
+from app.data.schema import create_all_tables
+from app.services.password_pool import password_pool
+from app.services.user_service import login_user, password_cost_report
+
+
+def measure_verify(cost):
+    password_hash = bcrypt.hashpw(b"pw", bcrypt.gensalt(cost))
+    started = time.perf_counter()
+    bcrypt.checkpw(b"pw", password_hash)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--old-cost", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'target ms':>10}{'cost':>6}{'estimated ms':>14}{'measured ms':>13}{'calibration s':>15}")
+    for target in (50, 100, 250, 500):
+        calibration = bcrypt_cost.calibrate(target_ms=target, min_cost=4)
+        print(f"{target:>10}{calibration.cost:>6}{calibration.estimated_ms:>14.0f}"
+              f"{measure_verify(calibration.cost):>13.0f}{calibration.seconds:>15.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        query_cache.db_path = db.DB_PATH
+        conn = db.connect_database()
+        create_all_tables(conn)
+        stale = bcrypt.hashpw(b"secret", bcrypt.gensalt(args.old_cost)).decode()
+        conn.executemany("INSERT INTO users (username, password_hash, role) VALUES (?, ?, 'user')",
+                         [(f"user{i}", stale) for i in range(args.users)])
+        conn.commit()
+        conn.close()
+
+        print(f"\ncalibrated cost {bcrypt_cost.get_bcrypt_cost()}, "
+              f"{args.users} users hashed at cost {args.old_cost}")
+        print(f"before: {password_cost_report()}")
+        started = time.perf_counter()
+        for i in range(args.users):
+            login_user(f"user{i}", "secret")
+        login_s = time.perf_counter() - started
+        password_pool.shutdown(wait=True)  # let the background re-hashes finish
+        print(f"after:  {password_cost_report()}")
+        print(f"avg login {login_s / args.users * 1000:.0f} ms (re-hash not waited on), "
+              f"re-hashes done {time.perf_counter() - started:.2f} s after the first login")
+
+        db.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Incident insert throughput: insert_incident per row vs insert_incidents_bulk.
+
+The per-row loop commits (and syncs) once per incident, like the original
+feed loaders; the bulk path streams rows through executemany in one
+transaction.
+
+Run from the project folder:
+    python benchmarks/bench_bulk_insert.py --rows 100000 --loop-rows 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, close_all_pools
+from app.data.schema import create_cyber_incidents_table
+from app.data.incidents import insert_incident, insert_incidents_bulk
+
+
+def make_rows(n):
+    rng = random.Random(1)
+    for i in range(n):
+        yield (f"Incident #{i}", rng.choice(["low", "medium", "high", "critical"]),
+               rng.choice(["open", "investigating", "resolved"]), "2024-11-25")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows for the bulk insert")
+    parser.add_argument("--loop-rows", type=int, default=5_000,
+                        help="rows for the per-row loop (it is much slower)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        conn = connect_database(db_path)
+        create_cyber_incidents_table(conn)
+
+        start = time.perf_counter()
+        for row in make_rows(args.loop_rows):
+            insert_incident(*row, conn=conn)
+        loop_rate = args.loop_rows / (time.perf_counter() - start)
+        conn.close()
+
+        bulk_conn = connect_database(db_path, profile="bulk-ingest")
+        start = time.perf_counter()
+        result = insert_incidents_bulk(make_rows(args.rows), chunk_size=args.chunk_size,
+                                       conn=bulk_conn)
+        bulk_rate = args.rows / (time.perf_counter() - start)
+        bulk_conn.close()
+        close_all_pools()
+
+    print(f"per-row insert_incident : {loop_rate:12,.0f} rows/s ({args.loop_rows:,} rows)")
+    print(f"insert_incidents_bulk   : {bulk_rate:12,.0f} rows/s ({args.rows:,} rows)")
+    print(f"speed-up                : {bulk_rate / loop_rate:12,.1f}x")
+    print(f"rows inserted           : {result.inserted:12,}")
+
+
+if __name__ == "__main__":
+    main()
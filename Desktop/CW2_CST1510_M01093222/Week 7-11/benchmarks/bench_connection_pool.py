@@ -0,0 +1,90 @@
+"""
+Per-query latency: new sqlite3 connection per query vs pooled connections.
+
+Run from the project folder:
+    python benchmarks/bench_connection_pool.py --queries 5000 --threads 4
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, pool_stats, close_all_pools
+from app.data.schema import create_it_tickets_table
+
+QUERY = "SELECT id, title, priority, status FROM it_tickets WHERE id = ?"
+
+
+def seed(db_path, rows):
+    conn = sqlite3.connect(str(db_path))
+    create_it_tickets_table(conn)
+    conn.executemany(
+        "INSERT INTO it_tickets (title, priority, status) VALUES (?, ?, ?)",
+        ((f"Ticket #{i}", "low", "open") for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_raw(db_path, queries, rows):
+    for i in range(queries):
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(QUERY, (i % rows + 1,)).fetchone()
+        conn.close()
+
+
+def run_pooled(db_path, queries, rows):
+    for i in range(queries):
+        conn = connect_database(db_path)
+        conn.execute(QUERY, (i % rows + 1,)).fetchone()
+        conn.close()
+
+
+def timed(fn, db_path, queries, rows, threads):
+    workers = [threading.Thread(target=fn, args=(db_path, queries, rows))
+               for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return elapsed / (queries * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=5000, help="queries per thread")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        seed(db_path, args.rows)
+
+        raw_us = timed(run_raw, db_path, args.queries, args.rows, args.threads)
+        pooled_us = timed(run_pooled, db_path, args.queries, args.rows, args.threads)
+
+        print(f"queries: {args.queries} x {args.threads} threads")
+        print(f"connect-per-query : {raw_us:8.1f} us/query")
+        print(f"pooled            : {pooled_us:8.1f} us/query")
+        print(f"speed-up          : {raw_us / pooled_us:8.1f}x")
+        print("pool stats:")
+        for key, value in pool_stats(db_path).items():
+            print(f"  {key}: {value}")
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+DataFrame memory of the readers: SELECT * with object dtypes against the
+compact dtypes of app.data.frames, for the whole row and for a projection.
+
+Sizes come from memory_usage(deep=True), so string contents are counted.
+
+Run from the project folder:
+    python benchmarks/bench_frame_memory.py --rows 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, close_all_pools
+from app.data.schema import create_all_tables
+from app.data.bulk import bulk_insert
+from app.data.frames import read_frame, memory_report
+
+# table -> (insert columns, row factory, projection a page typically needs)
+TABLES = {
+    "cyber_incidents": (
+        ["title", "severity", "status", "date"],
+        lambda rng, i: (f"Incident {i} on host-{rng.randint(1, 500)}",
+                        rng.choice(["Low", "Medium", "High", "Critical"]),
+                        rng.choice(["Open", "In Progress", "Resolved", "Closed"]),
+                        f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"),
+        ["severity", "status"],
+    ),
+    "it_tickets": (
+        ["title", "priority", "status", "created_date"],
+        lambda rng, i: (f"Ticket {i}: {rng.choice(['VPN', 'Laptop', 'Email', 'Printer'])} issue",
+                        rng.choice(["Low", "Medium", "High", "Critical"]),
+                        rng.choice(["Open", "In Progress", "Resolved", "Closed"]),
+                        f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"),
+        ["id", "priority", "status"],
+    ),
+    "datasets_metadata": (
+        ["name", "source", "category", "size"],
+        lambda rng, i: (f"dataset_{i}.csv",
+                        rng.choice(["Internal", "Kaggle", "Government", "Vendor"]),
+                        rng.choice(["Security", "Finance", "HR", "Operations", "IT"]),
+                        rng.randint(1_000, 50_000_000)),
+        ["id", "category", "size"],
+    ),
+}
+
+
+def mb(nbytes):
+    return nbytes / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", action="store_true", help="show per-column bytes")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db", profile="bulk-ingest")
+        create_all_tables(conn)
+
+        print(f"{args.rows:,} rows per table")
+        print(f"{'table':<20}{'SELECT * MB':>13}{'compact MB':>12}{'projected MB':>14}{'cut':>8}")
+        for table, (columns, make_row, projection) in TABLES.items():
+            bulk_insert(conn, table, columns, (make_row(rng, i) for i in range(args.rows)))
+
+            raw = memory_report(pd.read_sql_query(f"SELECT * FROM {table} ORDER BY id DESC", conn))
+            compact = memory_report(read_frame(conn, table))
+            projected = memory_report(read_frame(conn, table, projection))
+            cut = raw["total"] / projected["total"]
+            print(f"{table:<20}{mb(raw['total']):>13.1f}{mb(compact['total']):>12.1f}"
+                  f"{mb(projected['total']):>14.1f}{cut:>7.1f}x")
+
+            if args.columns:
+                for col, nbytes in raw["columns"].items():
+                    after = compact["columns"].get(col)
+                    shown = f"{mb(after):>12.2f}" if after is not None else f"{'':>12}"
+                    print(f"  {col:<18}{mb(nbytes):>13.2f}{shown}")
+
+        conn.close()
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Latency of search_incidents (FTS5) against a LIKE scan on a large table.
+
+Run from the project folder:
+    python benchmarks/bench_incident_search.py --rows 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, close_all_pools
+from app.data.schema import create_all_tables
+from app.data.bulk import bulk_insert
+from app.data.incidents import search_incidents
+
+WORDS = ["phishing", "ransomware", "malware", "ddos", "breach", "credential", "finance",
+         "payroll", "vpn", "firewall", "laptop", "server", "email", "invoice", "login",
+         "database", "backup", "endpoint", "usb", "badge"]
+QUERIES = ["ransomware payroll", "vpn login", "usb", "credential fin", "breach server backup",
+           "kavolu", "mirepa tosuka"]
+
+
+def make_vocabulary(size=20_000):
+    """Security words plus pseudo-words, so rare terms are as selective as in real text."""
+    rng = random.Random(2)
+    syllables = ["ka", "vo", "lu", "mi", "re", "pa", "to", "su", "ne", "di", "ra", "ge"]
+    vocab = set(WORDS)
+    while len(vocab) < size:
+        vocab.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(vocab)
+
+
+def make_rows(n):
+    rng = random.Random(1)
+    vocab = make_vocabulary()
+    # Zipf-like: a few words are everywhere, most are rare
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    for i in range(n):
+        words = rng.choices(vocab, weights=weights, k=14)
+        yield (f"{words[0].title()} on {words[1]} #{i}",
+               rng.choice(["low", "medium", "high", "critical"]), "open", "2024-11-25",
+               " ".join(words[2:]))
+
+
+def timed_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db", profile="bulk-ingest")
+        create_all_tables(conn)
+        bulk_insert(conn, "cyber_incidents", ["title", "severity", "status", "date", "description"],
+                    make_rows(args.rows))
+
+        print(f"{args.rows:,} incidents")
+        print(f"{'query':<24}{'fts5 ms':>10}{'LIKE ms':>10}")
+        for query in QUERIES:
+            fts_ms = timed_ms(lambda: search_incidents(query, limit=20, conn=conn))
+            words = query.split()
+            where = " AND ".join("(title || ' ' || description) LIKE ?" for _ in words)
+            like_ms = timed_ms(lambda: conn.execute(
+                f"SELECT id FROM cyber_incidents WHERE {where} ORDER BY id DESC LIMIT 20",
+                [f"%{w}%" for w in words]).fetchall(), repeat=1)
+            print(f"{query:<24}{fts_ms:>10.1f}{like_ms:>10.1f}")
+
+        conn.close()
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+CSV ingestion throughput and peak memory for app/data/ingest.ingest_csv.
+
+Generates an incidents CSV of the requested size, streams it into a fresh
+database and reports rows/s and the process's peak RSS. Python-side memory
+is one chunk; RSS also includes SQLite's page cache and mmap, which are
+capped by the bulk-ingest profile, so it levels off as --rows grows.
+
+Run from the project folder:
+    python benchmarks/bench_ingest.py --rows 1000000 --chunk-size 50000
+"""
+
+import argparse
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, close_all_pools
+from app.data.schema import create_cyber_incidents_table
+from app.data.ingest import ingest_csv
+
+
+def write_csv(path, rows):
+    rng = random.Random(1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ID", "Title", "Severity", "Status", "Date"])
+        for i in range(1, rows + 1):
+            writer.writerow([i, f"Incident #{i}", rng.choice(["low", "medium", "high", "critical"]),
+                             rng.choice(["open", "investigating", "resolved"]),
+                             f"202{rng.randint(0, 4)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "incidents.csv"
+        write_csv(csv_path, args.rows)
+        size_mb = csv_path.stat().st_size / (1024 * 1024)
+
+        conn = connect_database(Path(tmp) / "bench.db", profile="bulk-ingest")
+        create_cyber_incidents_table(conn)
+
+        def report(progress):
+            print(f"\r  {progress.rows_written:>12,} rows  {progress.rows_per_sec:>10,.0f} rows/s",
+                  end="", flush=True)
+
+        result = ingest_csv(csv_path, "cyber_incidents", conn=conn,
+                            chunk_size=args.chunk_size, progress=report)
+        conn.close()
+        close_all_pools()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print()
+    print(f"file size : {size_mb:,.1f} MB")
+    print(f"written   : {result.rows_written:,} rows, {result.rows_rejected:,} rejected, "
+          f"{result.rows_skipped:,} skipped")
+    print(f"rate      : {result.rows_per_sec:,.0f} rows/s")
+    print(f"peak RSS  : {peak_mb:,.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Latency of N simultaneous logins: bcrypt run inline on every caller's
+thread (the old login_user) against login_user on the bounded bcrypt pool.
+
+Each login is timed from the moment all N threads are released. Hashes
+use --rounds (bcrypt cost) so the run stays short; real accounts use 12.
+
+Run from the project folder:
+    python benchmarks/bench_login_concurrency.py --logins 50 --rounds 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import bcrypt
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.data.db as db
+from app.data.cache import query_cache
+from app.data.schema import create_all_tables
+from app.services.user_service import login_user
+from app.services.password_pool import password_pool_stats
+
+PASSWORD = "Shift-Change-2024"
+
+
+def inline_login(username):
+    """login_user as it was: the lookup, then bcrypt on the calling thread."""
+    with db.pooled_connection() as conn:
+        stored_hash, _ = conn.execute(
+            "SELECT password_hash, role FROM users WHERE username = ?", (username,)).fetchone()
+    return bcrypt.checkpw(PASSWORD.encode("utf-8"), stored_hash.encode("utf-8"))
+
+
+def burst(n, login):
+    """Start n logins at once; return their latencies in ms."""
+    barrier = threading.Barrier(n + 1)
+    latencies = [None] * n
+
+    def user(i):
+        barrier.wait()
+        started = time.perf_counter()
+        ok = login(f"user{i}")
+        latencies[i] = (time.perf_counter() - started) * 1000 if ok else None
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    failed = latencies.count(None)
+    if failed:
+        raise SystemExit(f"{failed} logins failed")
+    return sorted(latencies)
+
+
+def report(name, latencies):
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    print(f"{name:<22}{statistics.median(latencies):>10.0f}{p99:>10.0f}{latencies[-1]:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        query_cache.db_path = db.DB_PATH
+        conn = db.connect_database()
+        create_all_tables(conn)
+        password_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(args.rounds))
+        conn.executemany(
+            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, 'user')",
+            ((f"user{i}", password_hash.decode("utf-8")) for i in range(args.logins)))
+        conn.commit()
+        conn.close()
+
+        print(f"{args.logins} simultaneous logins, bcrypt cost {args.rounds}, "
+              f"{os.cpu_count()} CPU(s)")
+        print(f"{'':<22}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        report("inline bcrypt", burst(args.logins, inline_login))
+        report("bcrypt pool", burst(args.logins, lambda u: login_user(u, PASSWORD)[0]))
+
+        stats = password_pool_stats()
+        print(f"pool: {stats['workers']} workers, max queue depth {stats['max_queue_depth']}, "
+              f"avg wait {stats['avg_wait_ms']:.0f} ms, avg run {stats['avg_run_ms']:.0f} ms, "
+              f"{stats['rejected']} rejected")
+
+        db.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
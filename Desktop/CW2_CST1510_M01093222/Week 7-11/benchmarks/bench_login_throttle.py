@@ -0,0 +1,72 @@
+"""
+Credential stuffing against login_user: wrong passwords fired at one
+account from one client, with the login throttle effectively off and on.
+Reports wall time, bcrypt checks run and the throttle's counters.
+
+Run from the project folder:
+    python benchmarks/bench_login_throttle.py --attempts 200 --rounds 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bcrypt
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.data.db as db
+import app.services.login_throttle as throttle
+from app.data.cache import query_cache
+from app.data.schema import create_all_tables
+from app.services.user_service import login_user
+from app.services.password_pool import password_pool_stats
+
+
+def attack(attempts):
+    """Fire `attempts` bad logins; return (seconds, bcrypt checks run)."""
+    checks_before = password_pool_stats()["completed"]
+    started = time.perf_counter()
+    for i in range(attempts):
+        login_user("victim", f"guess-{i}", client="203.0.113.7")
+    return time.perf_counter() - started, password_pool_stats()["completed"] - checks_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        query_cache.db_path = db.DB_PATH
+        conn = db.connect_database()
+        create_all_tables(conn)
+        conn.execute("INSERT INTO users (username, password_hash, role) VALUES ('victim', ?, 'user')",
+                     (bcrypt.hashpw(b"correct horse", bcrypt.gensalt(args.rounds)).decode(),))
+        conn.commit()
+        conn.close()
+
+        print(f"{args.attempts} bad logins against one account, bcrypt cost {args.rounds}")
+        print(f"{'':<16}{'seconds':>10}{'bcrypt checks':>15}{'throttled':>11}")
+        for name, limiter in (("no throttle", throttle.LoginThrottle(max_per_user=10**9,
+                                                                     max_per_account=10**9,
+                                                                     max_per_client=10**9)),
+                              ("throttle", throttle.LoginThrottle())):
+            throttle.login_throttle = limiter
+            seconds, checks = attack(args.attempts)
+            print(f"{name:<16}{seconds:>10.2f}{checks:>15}{limiter.stats()['throttled']:>11}")
+
+        db.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cost of authenticating a page view: a full login_user (bcrypt) against
+verify_session with a cold and a warm verification cache.
+
+Run from the project folder:
+    python benchmarks/bench_session_verify.py --repeat 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.data.db as db
+from app.data.cache import query_cache
+from app.data.schema import create_all_tables
+from app.services.user_service import register_user, login_user
+from app.services.session_store import get_session_store, issue_session, verify_session
+
+
+def per_call_us(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        query_cache.db_path = db.DB_PATH
+        conn = db.connect_database()
+        create_all_tables(conn)
+        conn.close()
+
+        register_user("bench", "Bench-Pass-123")
+        token = issue_session("bench")
+
+        bcrypt_us = per_call_us(lambda: login_user("bench", "Bench-Pass-123"), 5)
+
+        def cold():
+            get_session_store().clear_cache()
+            verify_session(token)
+
+        cold_us = per_call_us(cold, args.repeat)
+        warm_us = per_call_us(lambda: verify_session(token), args.repeat)
+        forged_us = per_call_us(lambda: verify_session(token[:-4] + "AAAA"), args.repeat)
+
+        print(f"{'login_user (bcrypt)':<34}{bcrypt_us:>12.1f} us")
+        print(f"{'verify_session, cold cache':<34}{cold_us:>12.1f} us")
+        print(f"{'verify_session, cached':<34}{warm_us:>12.1f} us")
+        print(f"{'verify_session, forged token':<34}{forged_us:>12.1f} us")
+
+        db.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
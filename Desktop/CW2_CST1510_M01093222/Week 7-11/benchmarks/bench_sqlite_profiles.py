@@ -0,0 +1,126 @@
+"""
+Mixed read/write throughput for each SQLite profile in app/data/db.PROFILES.
+
+Readers run the dashboard-style queries while one writer inserts incidents
+the way the Cybersecurity create form does (one commit per row).
+"default" is plain sqlite3 settings (rollback journal) for comparison.
+
+Run from the project folder:
+    python benchmarks/bench_sqlite_profiles.py --rows 100000 1000000 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import PROFILES, apply_profile
+from app.data.schema import create_cyber_incidents_table
+
+SEVERITIES = ["low", "medium", "high", "critical"]
+STATUSES = ["open", "investigating", "resolved", "closed"]
+
+READ_QUERIES = [
+    ("SELECT severity, COUNT(*) FROM cyber_incidents GROUP BY severity", ()),
+    ("SELECT * FROM cyber_incidents ORDER BY id DESC LIMIT 100", ()),
+    ("SELECT * FROM cyber_incidents WHERE id = ?", None),
+]
+
+
+def seed(db_path, rows):
+    conn = sqlite3.connect(str(db_path))
+    create_cyber_incidents_table(conn)
+    rng = random.Random(1)
+    conn.executemany(
+        "INSERT INTO cyber_incidents (title, severity, status, date) VALUES (?, ?, ?, ?)",
+        ((f"Incident #{i}", rng.choice(SEVERITIES), rng.choice(STATUSES),
+          f"202{rng.randint(0, 4)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+         for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def open_conn(db_path, profile):
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+    if profile != "default":
+        apply_profile(conn, profile)
+    return conn
+
+
+def reader(db_path, profile, rows, stop, counts):
+    conn = open_conn(db_path, profile)
+    rng = random.Random()
+    while not stop.is_set():
+        sql, params = rng.choice(READ_QUERIES)
+        conn.execute(sql, params if params is not None else (rng.randint(1, rows),)).fetchall()
+        counts["reads"] += 1
+    conn.close()
+
+
+def writer(db_path, profile, stop, counts):
+    # read-only-analytics refuses writes; the forms use "interactive"
+    conn = open_conn(db_path, "interactive" if profile == "read-only-analytics" else profile)
+    while not stop.is_set():
+        try:
+            conn.execute(
+                "INSERT INTO cyber_incidents (title, severity, status, date) VALUES (?, ?, ?, ?)",
+                ("Benchmark incident", "high", "open", "2024-11-25"),
+            )
+            conn.commit()
+            counts["writes"] += 1
+        except sqlite3.OperationalError:
+            counts["busy"] += 1
+    conn.close()
+
+
+def run(template, profile, rows, seconds, readers):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        shutil.copy(template, db_path)
+        counts = {"reads": 0, "writes": 0, "busy": 0}
+        stop = threading.Event()
+        threads = [threading.Thread(target=reader, args=(db_path, profile, rows, stop, counts))
+                   for _ in range(readers)]
+        threads.append(threading.Thread(target=writer, args=(db_path, profile, stop, counts)))
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+    return {k: v / seconds for k, v in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            template = Path(tmp) / "template.db"
+            seed(template, rows)
+            print(f"\n{rows:,} incident rows, {args.readers} readers + 1 writer, {args.seconds}s")
+            print(f"{'profile':<22}{'reads/s':>12}{'writes/s':>12}{'busy/s':>10}")
+            for profile in ["default", *PROFILES]:
+                result = run(template, profile, rows, args.seconds, args.readers)
+                print(f"{profile:<22}{result['reads']:>12,.0f}{result['writes']:>12,.0f}"
+                      f"{result['busy']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
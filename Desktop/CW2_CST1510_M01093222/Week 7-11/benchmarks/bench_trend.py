@@ -0,0 +1,84 @@
+"""
+Incident trend series: SQL bucketing (get_trend) against loading every row
+into pandas and resampling.
+
+Run from the project folder:
+    python benchmarks/bench_trend.py --rows 500000 --years 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, close_all_pools
+from app.data.schema import create_all_tables
+from app.data.bulk import bulk_insert
+from app.data.aggregates import get_trend
+
+
+def make_rows(n, years):
+    rng = random.Random(1)
+    first = date.today() - timedelta(days=365 * years)
+    for i in range(n):
+        day = first + timedelta(days=rng.randrange(365 * years))
+        yield (f"Incident {i}", rng.choice(["Low", "Medium", "High", "Critical"]),
+               rng.choice(["Open", "Resolved"]), day.isoformat())
+
+
+def timed_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def pandas_trend(conn):
+    df = pd.read_sql_query("SELECT date FROM cyber_incidents", conn, parse_dates=["date"])
+    return df.set_index("date").resample("D").size()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db", profile="bulk-ingest")
+        create_all_tables(conn)
+        bulk_insert(conn, "cyber_incidents", ["title", "severity", "status", "date"],
+                    make_rows(args.rows, args.years))
+
+        print(f"{args.rows:,} incidents over {args.years} years")
+        print(f"{'series':<32}{'ms':>9}{'points':>9}")
+        ms, series = timed_ms(lambda: pandas_trend(conn), repeat=1)
+        print(f"{'pandas, all rows, daily':<32}{ms:>9.1f}{len(series):>9}")
+
+        today = date.today()
+        for label, days in (("last 90 days", 90), ("last 2 years", 730), ("everything", None)):
+            start = today - timedelta(days=days) if days else None
+            ms, trend = timed_ms(lambda: get_trend("incidents", start=start, conn=conn))
+            name = f"get_trend, {label} ({trend['granularity']})"
+            print(f"{name:<32}{ms:>9.1f}{len(trend['period']):>9}")
+
+        conn.close()
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+users.txt migration: one INSERT per line with an IntegrityError per
+duplicate (the old migrate_users_from_file, minus its prints) against the
+streaming bulk_migrate_users.
+
+The file has 2% duplicate usernames and 1% malformed lines. Peak Python
+memory of bulk_migrate_users is then measured with tracemalloc (which
+slows it down, so separately) on files of increasing size; it should not
+grow with the file.
+
+Run from the project folder:
+    python benchmarks/bench_user_migration.py --lines 2000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.data.db import connect_database, close_all_pools
+from app.data.schema import create_users_table
+from app.services.user_service import bulk_migrate_users
+
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+def write_users_file(path, lines):
+    rng = random.Random(1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("username,password_hash,role\n")
+        for i in range(lines):
+            roll = rng.random()
+            if roll < 0.01:
+                f.write(f"broken line {i}\n")
+            elif roll < 0.03:
+                f.write(f"user{rng.randrange(max(i, 1))},{FAKE_HASH},user\n")
+            else:
+                f.write(f"user{i},{FAKE_HASH},{rng.choice(['user', 'analyst', 'admin'])}\n")
+
+
+def per_line_migrate(conn, path):
+    """The old loop: parse, INSERT, catch IntegrityError, one row at a time."""
+    cursor = conn.cursor()
+    migrated = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = [p.strip() for p in line.split(",")]
+            if len(parts) < 2:
+                continue
+            role = parts[2] if len(parts) >= 3 else "user"
+            try:
+                cursor.execute("INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                               (parts[0], parts[1], role))
+                migrated += 1
+            except sqlite3.IntegrityError:
+                pass
+    conn.commit()
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "users.txt"
+        write_users_file(path, args.lines)
+        print(f"{args.lines:,} lines, {path.stat().st_size / 1e6:.0f} MB")
+
+        conn = connect_database(Path(tmp) / "old.db", profile="bulk-ingest")
+        create_users_table(conn)
+        started = time.perf_counter()
+        migrated = per_line_migrate(conn, path)
+        seconds = time.perf_counter() - started
+        print(f"{'per-line INSERT':<18}{seconds:>8.1f} s {args.lines / seconds:>12,.0f} lines/s"
+              f"  {migrated:,} inserted")
+        conn.close()
+
+        conn = connect_database(Path(tmp) / "bulk.db", profile="bulk-ingest")
+        create_users_table(conn)
+        summary = bulk_migrate_users(conn, path)
+        print(f"{'bulk_migrate_users':<18}{summary.seconds:>8.1f} s {summary.rows_per_sec:>12,.0f} lines/s"
+              f"  {summary.inserted:,} inserted, {summary.skipped:,} skipped, "
+              f"{summary.malformed:,} malformed")
+        conn.close()
+
+        for lines in (args.lines // 100, args.lines // 10):
+            small = Path(tmp) / f"users_{lines}.txt"
+            write_users_file(small, lines)
+            conn = connect_database(Path(tmp) / f"peak_{lines}.db", profile="bulk-ingest")
+            create_users_table(conn)
+            tracemalloc.start()
+            bulk_migrate_users(conn, small)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"peak Python memory at {lines:>10,} lines: {peak / 1e6:.1f} MB")
+            conn.close()
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
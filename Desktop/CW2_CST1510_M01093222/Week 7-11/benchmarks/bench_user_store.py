@@ -0,0 +1,82 @@
+"""
+Username lookups in the file-based auth of "wk 7.py": the old full scan of
+users.txt on every call against the UserStore index, at 1M users.
+
+Hashes are fixed strings, so only the file handling is measured (not bcrypt).
+
+Run from the project folder:
+    python benchmarks/bench_user_store.py --users 1000000
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+def load_wk7():
+    """Import "wk 7.py" (its name is not a valid module name)."""
+    spec = importlib.util.spec_from_file_location("wk7", os.path.join(ROOT, "wk 7.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scan_user_exists(path, username):
+    """user_exists as it was: read every line on each call."""
+    with open(path, 'r') as f:
+        for line in f.readlines():
+            if line.strip().split(',')[0] == username:
+                return True
+    return False
+
+
+def timed_ms(fn, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    wk7 = load_wk7()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.txt")
+        with open(path, "w") as f:
+            f.writelines(f"user{i},{FAKE_HASH}\n" for i in range(args.users))
+        last = f"user{args.users - 1}"
+
+        print(f"{args.users:,} users, {os.path.getsize(path) / 1e6:.0f} MB")
+        print(f"{'full scan per lookup (old)':<40}{timed_ms(lambda: scan_user_exists(path, last), 3):>10.2f} ms")
+
+        store = wk7.UserStore(path)
+        print(f"{'UserStore first load':<40}{timed_ms(store.refresh):>10.2f} ms")
+        lookup_ms = timed_ms(lambda: store.exists(last), args.lookups)
+        print(f"{'UserStore lookup':<40}{lookup_ms * 1000:>10.2f} us")
+
+        # Another process registers 1000 users: only their bytes are read
+        with open(path, "a") as f:
+            f.writelines(f"new{i},{FAKE_HASH}\n" for i in range(1000))
+        print(f"{'refresh after 1000 appended users':<40}{timed_ms(store.refresh):>10.2f} ms")
+        print(f"{'UserStore.add (atomic append)':<40}"
+              f"{timed_ms(lambda: store.add(f'added{time.perf_counter_ns()}', FAKE_HASH), 1000):>10.3f} ms")
+        assert store.exists("new999") and len(store) == args.users + 1000 + 1000
+
+
+if __name__ == "__main__":
+    main()
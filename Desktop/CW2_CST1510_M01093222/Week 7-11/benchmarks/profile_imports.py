@@ -0,0 +1,173 @@
+"""
+Cold-start profile of Home.py and every page, with a time budget.
+
+Each page is run in a fresh interpreter (so nothing is already imported)
+through Streamlit's AppTest, twice: logged out, where it should stop at its
+guard, and logged in. For each run it reports the time to first paint
+(the full script run) and, from `python -X importtime`, the modules the
+page itself imported, slowest first. Streamlit, and the parts of it it
+imports lazily, are loaded before the clock starts, as they already are
+in a running server, and AppTest's own per-run overhead (measured on a
+blank script) is subtracted.
+
+Pages run against a scratch copy of DATA/intelligence_platform.db.
+The exit status is 1 if any run exceeds its budget, so this can gate CI:
+
+    python benchmarks/profile_imports.py --guard-budget-ms 50 --budget-ms 2000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+MARKER = "--- page run starts ---"
+
+
+def run_child(page, db_path, logged_in):
+    """Child process: run one page once and print its timing as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    import app.data.db as db
+    from app.data.cache import query_cache
+
+    db.DB_PATH = Path(db_path)
+    query_cache.db_path = db.DB_PATH
+
+    # Load Streamlit's own lazily-imported internals, as a running server has
+    warmup = AppTest.from_string(
+        "import streamlit as st\n"
+        "st.set_page_config(page_icon='📊', layout='wide')\n"
+        "st.error('x'); st.button('x'); st.columns(2); st.tabs(['x'])\n")
+    warmup.run()
+
+    # Fixed cost of an AppTest run of a trivial script, subtracted below
+    blank = AppTest.from_string("import streamlit as st\nst.write('x')\n")
+    started = time.perf_counter()
+    blank.run()
+    overhead_ms = (time.perf_counter() - started) * 1000
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=120)
+    if logged_in:
+        from app.services.session_store import issue_session
+
+        with db.pooled_connection() as conn:
+            conn.execute("INSERT OR IGNORE INTO users (username, password_hash, role) "
+                         "VALUES ('profile', 'x', 'admin')")
+            conn.commit()
+        at.session_state.session_token = issue_session("profile")
+
+    print(MARKER, file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    at.run()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    error = at.exception[0].message if at.exception else None
+    print(json.dumps({"first_paint_ms": max(elapsed_ms - overhead_ms, 0.0),
+                      "overhead_ms": overhead_ms, "error": error}))
+
+
+def parse_importtime(stderr):
+    """Top-level modules imported after MARKER, as (cumulative ms, name), slowest first."""
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Nested imports are indented under their parent
+        if len(name) - len(name.lstrip()) != 1 or not cumulative.strip().isdigit():
+            continue
+        modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)
+
+
+def profile_page(page, db_path, logged_in):
+    args = [sys.executable, "-X", "importtime", os.path.abspath(__file__),
+            "--child", page, "--db", str(db_path)]
+    if logged_in:
+        args.append("--logged-in")
+    result = subprocess.run(args, cwd=ROOT, capture_output=True, text=True)
+    try:
+        timing = json.loads(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        timing = {"first_paint_ms": None, "error": result.stderr.strip().splitlines()[-1:]}
+    timing["imports"] = parse_importtime(result.stderr)
+    return timing
+
+
+def list_pages():
+    pages = ["Home.py"]
+    pages += sorted(f"pages/{name}" for name in os.listdir(os.path.join(ROOT, "pages"))
+                    if name.endswith(".py"))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guard-budget-ms", type=float, default=50,
+                        help="budget for a logged-out visit (page guard)")
+    parser.add_argument("--budget-ms", type=float, default=2000,
+                        help="budget for a logged-in first paint")
+    parser.add_argument("--top", type=int, default=5, help="modules listed per run")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--logged-in", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.db, args.logged_in)
+        return
+
+    from app.data.bootstrap import bootstrap
+    import app.data.db as db
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "profile.db"
+        shutil.copy(db.DB_PATH, db_path)
+        # Migrate and seed once, so no page pays for it during the profile
+        db.DB_PATH = db_path
+        bootstrap(conn=db.connect_database(db_path))
+        db.close_all_pools()
+
+        for page in list_pages():
+            for logged_in in (False, True):
+                budget = args.budget_ms if logged_in else args.guard_budget_ms
+                timing = profile_page(page, db_path, logged_in)
+                ms = timing["first_paint_ms"]
+                state = "logged in " if logged_in else "logged out"
+                status = "ok"
+                if timing["error"]:
+                    status = f"error: {timing['error']}"
+                elif ms is not None and ms > budget:
+                    status = f"OVER BUDGET ({budget:.0f} ms)"
+                    failures.append((page, state, ms))
+
+                shown = f"{ms:8.1f} ms" if ms is not None else "       n/a"
+                imported = sum(cumulative for cumulative, _ in timing["imports"])
+                print(f"{page:<28} {state} {shown}  imports {imported:7.1f} ms  {status}")
+                for cumulative, name in timing["imports"][:args.top]:
+                    print(f"{'':<41}{cumulative:8.1f} ms  {name}")
+
+    if failures:
+        print(f"\n{len(failures)} run(s) over budget")
+        sys.exit(1)
+    print("\nAll pages within budget")
+
+
+if __name__ == "__main__":
+    main()
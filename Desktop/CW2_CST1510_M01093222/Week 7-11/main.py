@@ -1,8 +1,10 @@
 import pandas as pd
 from pathlib import Path
 from app.data.db import connect_database, DB_PATH, DATA_DIR
-from app.data.schema import create_all_tables
-from app.services.user_service import register_user, login_user, migrate_users_from_file
+from app.data.bootstrap import bootstrap
+from app.services.user_service import (register_user, login_user, migrate_users_from_file,
+                                       password_cost_report)
+from app.services.bcrypt_cost import get_calibration
 from app.data.incidents import insert_incident, get_all_incidents
 
 
@@ -50,39 +52,20 @@ def main():
 
     # 1. Setup database
     conn = connect_database()
-    create_all_tables(conn)
-
-    # Ensure datasets and tickets are loaded if empty
-    def _load_csv_if_empty(table_name, keyword):
-        cur = conn.cursor()
-        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
-        cnt = cur.fetchone()[0]
-        if cnt > 0:
-            return 0
-
-        # find file in DATA_DIR containing keyword
-        found = None
-        for p in DATA_DIR.iterdir():
-            if p.is_file() and keyword in p.name.lower():
-                found = p
-                break
-        if not found:
-            return 0
 
-        try:
-            df = pd.read_csv(found)
-            df.columns = df.columns.str.strip()
-            df.to_sql(table_name, conn, if_exists='append', index=False)
-            return len(df)
-        except Exception:
-            return 0
+    # Load the DATA/ files that changed since the last run
+    def _report(progress):
+        print(f"  {progress.table}: {progress.rows_written} rows written, "
+              f"{progress.rows_rejected} rejected, {progress.rows_skipped} already present "
+              f"({progress.rows_per_sec:,.0f} rows/s)")
 
-    loaded_datasets = _load_csv_if_empty('datasets_metadata', 'datasets')
-    loaded_tickets = _load_csv_if_empty('it_tickets', 'ticket')
-    if loaded_datasets:
-        print(f"Loaded {loaded_datasets} rows into datasets_metadata")
-    if loaded_tickets:
-        print(f"Loaded {loaded_tickets} rows into it_tickets")
+    loaded = bootstrap(conn=conn, progress=_report)
+    for table, rows in loaded.items():
+        if rows:
+            print(f"Loaded {rows} rows into {table}")
+
+    calibration = get_calibration()
+    print(f"bcrypt cost {calibration.cost} (target {calibration.target_ms:.0f} ms per hash)")
 
     # 2. Migrate users from file (if present)
     migrated = migrate_users_from_file(conn)
@@ -95,11 +78,15 @@ def main():
     success, msg = login_user("demo_user", "DemoPass123!")
     print(f"Login: {msg}")
 
+    report = password_cost_report()
+    print(f"Password hashes by bcrypt cost: {report['costs']} "
+          f"({report['below_target']} to re-hash at next login)")
+
     # 4. Create an incident and list incidents
     incident_id = insert_incident("Phishing attempt", "High", "Open", "2024-11-25", conn=conn)
     print(f"Created incident id: {incident_id}")
 
-    df = get_all_incidents(conn=conn)
+    df = get_all_incidents(columns=["id"], conn=conn)
     print(f"Total incidents in DB: {len(df)}")
 
     # 5. Show tables and samples
@@ -1,14 +1,44 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from app.data.db import connect_database
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 
-if "logged_in" not in st.session_state or not st.session_state.logged_in:
+from app.ui.auth import restore_session
+
+if not restore_session():
     st.error("Please log in first!")
     st.stop()
 
+# Imported after the guard so a logged-out visit doesn't load pandas/plotly
+from app.data.aggregates import get_trend, get_trend_range
+from app.services.aggregate_refresher import get_aggregate_refresher
+from app.services.figure_cache import cached_figure, figure_cache_stats
+from app.ui.staleness import staleness_caption
+
+
+def show_trend(kind, label):
+    """Line chart of `kind` over a chosen date range, bucketed in SQL."""
+    first, last = get_trend_range(kind)
+    if first is None:
+        st.info(f"No dated {label.lower()} to plot")
+        return
+
+    selected = st.date_input("Date range", value=(first, last), min_value=first,
+                             max_value=last, key=f"{kind}_trend_range")
+    # While a range is being picked only its start is set
+    start, end = selected if len(selected) == 2 else (first, last)
+
+    trend = get_trend(kind, start, end)
+    fig = cached_figure(
+        "line",
+        {'period': trend["period"], 'count': trend["count"]},
+        x='period',
+        y='count',
+        markers=len(trend["period"]) <= 60,
+        labels={'period': trend["granularity"].title(), 'count': label}
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(trend['period'])} points, one per {trend['granularity']}")
+
 with st.sidebar:
     st.write(f"User: {st.session_state.username}")
     st.write(f"Role: {st.session_state.role.upper()}")
@@ -16,6 +46,15 @@ with st.sidebar:
 
 st.title("📊 Dashboard")
 
+# Platform-wide counts, recomputed in the background and shared by every session
+refresher = get_aggregate_refresher()
+try:
+    aggregates = refresher.snapshot()
+except Exception as e:
+    st.error(f"Error loading data: {str(e)}")
+    st.stop()
+staleness_caption(aggregates, refresher.interval)
+
 col1, col2 = st.columns([3, 1])
 
 with col2:
@@ -40,32 +79,24 @@ if "Cybersecurity" in dashboard_type:
         )
     
     try:
-        conn = connect_database()
-        incidents_df = pd.read_sql_query(
-            "SELECT * FROM cyber_incidents LIMIT 100",
-            conn
-        )
-        conn.close()
+        counts = aggregates.get("incident_counts")
         
-        if incidents_df.empty:
+        if not counts or counts["total"] == 0:
             st.warning("No incidents data available")
         else:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Incidents", len(incidents_df))
+                st.metric("Total Incidents", counts["total"])
             
             with col2:
-                critical = len(incidents_df[incidents_df['severity'].str.lower() == 'critical'])
-                st.metric("Critical", critical)
+                st.metric("Critical", counts["severity"].get("critical", 0))
             
             with col3:
-                high = len(incidents_df[incidents_df['severity'].str.lower() == 'high'])
-                st.metric("High", high)
+                st.metric("High", counts["severity"].get("high", 0))
             
             with col4:
-                resolved = len(incidents_df[incidents_df['status'].str.lower() == 'resolved'])
-                st.metric("Resolved", resolved)
+                st.metric("Resolved", counts["status"].get("resolved", 0))
             
             st.divider()
             
@@ -73,12 +104,14 @@ if "Cybersecurity" in dashboard_type:
             
             with col1:
                 st.subheader("Incidents by Severity")
-                severity_counts = incidents_df['severity'].value_counts()
-                severity_df = severity_counts.reset_index()
-                severity_df.columns = ['severity', 'count']
+                severity_df = {
+                    'severity': list(counts["severity"]),
+                    'count': list(counts["severity"].values())
+                }
                 
                 if chart_type == "Bar":
-                    fig = px.bar(
+                    fig = cached_figure(
+                        "bar",
                         severity_df,
                         x='severity',
                         y='count',
@@ -92,14 +125,16 @@ if "Cybersecurity" in dashboard_type:
                         }
                     )
                 elif chart_type == "Pie":
-                    fig = px.pie(
+                    fig = cached_figure(
+                        "pie",
                         severity_df,
                         values='count',
                         names='severity',
                         title="Severity Distribution"
                     )
                 else:
-                    fig = px.line(
+                    fig = cached_figure(
+                        "line",
                         severity_df,
                         x='severity',
                         y='count',
@@ -111,10 +146,12 @@ if "Cybersecurity" in dashboard_type:
             
             with col2:
                 st.subheader("Incidents by Status")
-                status_counts = incidents_df['status'].value_counts()
-                status_df = status_counts.reset_index()
-                status_df.columns = ['status', 'count']
-                fig = px.pie(
+                status_df = {
+                    'status': list(counts["status"]),
+                    'count': list(counts["status"].values())
+                }
+                fig = cached_figure(
+                    "pie",
                     status_df,
                     values='count',
                     names='status',
@@ -124,8 +161,14 @@ if "Cybersecurity" in dashboard_type:
             
             st.divider()
             
-            with st.expander("📋 View All Incidents"):
-                st.dataframe(incidents_df, use_container_width=True)
+            st.subheader("Incidents over Time")
+            show_trend("incidents", "Incidents")
+            
+            st.divider()
+            
+            with st.expander("📋 View Counts"):
+                st.dataframe(severity_df, use_container_width=True)
+                st.dataframe(status_df, use_container_width=True)
     
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
@@ -143,32 +186,24 @@ elif "IT Operations" in dashboard_type:
         )
     
     try:
-        conn = connect_database()
-        tickets_df = pd.read_sql_query(
-            "SELECT * FROM it_tickets LIMIT 100",
-            conn
-        )
-        conn.close()
+        counts = aggregates.get("ticket_counts")
         
-        if tickets_df.empty:
+        if not counts or counts["total"] == 0:
             st.warning("No tickets data available")
         else:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Tickets", len(tickets_df))
+                st.metric("Total Tickets", counts["total"])
             
             with col2:
-                open_tickets = len(tickets_df[tickets_df['status'].str.lower() == 'open'])
-                st.metric("Open", open_tickets)
+                st.metric("Open", counts["status"].get("open", 0))
             
             with col3:
-                in_progress = len(tickets_df[tickets_df['status'].str.lower() == 'in progress'])
-                st.metric("In Progress", in_progress)
+                st.metric("In Progress", counts["status"].get("in progress", 0))
             
             with col4:
-                closed = len(tickets_df[tickets_df['status'].str.lower() == 'closed'])
-                st.metric("Closed", closed)
+                st.metric("Closed", counts["status"].get("closed", 0))
             
             st.divider()
             
@@ -176,12 +211,14 @@ elif "IT Operations" in dashboard_type:
             
             with col1:
                 st.subheader("Tickets by Status")
-                status_counts = tickets_df['status'].value_counts()
-                status_df = status_counts.reset_index()
-                status_df.columns = ['status', 'count']
+                status_df = {
+                    'status': list(counts["status"]),
+                    'count': list(counts["status"].values())
+                }
                 
                 if chart_type == "Bar":
-                    fig = px.bar(
+                    fig = cached_figure(
+                        "bar",
                         status_df,
                         x='status',
                         y='count',
@@ -194,14 +231,16 @@ elif "IT Operations" in dashboard_type:
                         }
                     )
                 elif chart_type == "Pie":
-                    fig = px.pie(
+                    fig = cached_figure(
+                        "pie",
                         status_df,
                         values='count',
                         names='status',
                         title="Status Distribution"
                     )
                 else:
-                    fig = px.line(
+                    fig = cached_figure(
+                        "line",
                         status_df,
                         x='status',
                         y='count',
@@ -213,10 +252,12 @@ elif "IT Operations" in dashboard_type:
             
             with col2:
                 st.subheader("Tickets by Priority")
-                priority_counts = tickets_df['priority'].value_counts()
-                priority_df = priority_counts.reset_index()
-                priority_df.columns = ['priority', 'count']
-                fig = px.pie(
+                priority_df = {
+                    'priority': list(counts["priority"]),
+                    'count': list(counts["priority"].values())
+                }
+                fig = cached_figure(
+                    "pie",
                     priority_df,
                     values='count',
                     names='priority',
@@ -226,8 +267,14 @@ elif "IT Operations" in dashboard_type:
             
             st.divider()
             
-            with st.expander("📋 View All Tickets"):
-                st.dataframe(tickets_df, use_container_width=True)
+            st.subheader("Tickets over Time")
+            show_trend("tickets", "Tickets")
+            
+            st.divider()
+            
+            with st.expander("📋 View Counts"):
+                st.dataframe(status_df, use_container_width=True)
+                st.dataframe(priority_df, use_container_width=True)
     
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
@@ -245,31 +292,24 @@ elif "Data Analysis" in dashboard_type:
         )
     
     try:
-        conn = connect_database()
-        datasets_df = pd.read_sql_query(
-            "SELECT * FROM datasets_metadata LIMIT 100",
-            conn
-        )
-        conn.close()
+        counts = aggregates.get("dataset_counts")
         
-        if datasets_df.empty:
+        if not counts or counts["total"] == 0:
             st.warning("No datasets data available")
         else:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Datasets", len(datasets_df))
+                st.metric("Total Datasets", counts["total"])
             
             with col2:
-                unique_categories = datasets_df['category'].nunique()
-                st.metric("Categories", unique_categories)
+                st.metric("Categories", len(counts["category"]))
             
             with col3:
-                unique_owners = datasets_df['owner'].nunique() if 'owner' in datasets_df.columns else 0
-                st.metric("Owners", unique_owners)
+                st.metric("Sources", len(counts["source"]))
             
             with col4:
-                st.metric("Records", len(datasets_df))
+                st.metric("Records", counts["total"])
             
             st.divider()
             
@@ -277,12 +317,14 @@ elif "Data Analysis" in dashboard_type:
             
             with col1:
                 st.subheader("Datasets by Category")
-                category_counts = datasets_df['category'].value_counts()
-                category_df = category_counts.reset_index()
-                category_df.columns = ['category', 'count']
+                category_df = {
+                    'category': list(counts["category"]),
+                    'count': list(counts["category"].values())
+                }
                 
                 if chart_type == "Bar":
-                    fig = px.bar(
+                    fig = cached_figure(
+                        "bar",
                         category_df,
                         x='category',
                         y='count',
@@ -291,15 +333,17 @@ elif "Data Analysis" in dashboard_type:
                         color_continuous_scale="Blues"
                     )
                 elif chart_type == "Pie":
-                    fig = px.pie(
+                    fig = cached_figure(
+                        "pie",
                         category_df,
                         values='count',
                         names='category',
                         title="Category Distribution"
                     )
                 else:
-                    scatter_df = category_df.rename(columns={'category': 'Category', 'count': 'Count'})
-                    fig = px.scatter(
+                    scatter_df = {'Category': category_df['category'], 'Count': category_df['count']}
+                    fig = cached_figure(
+                        "scatter",
                         scatter_df,
                         x='Category',
                         y='Count',
@@ -312,24 +356,31 @@ elif "Data Analysis" in dashboard_type:
             
             with col2:
                 st.subheader("Data Distribution")
-                if 'format' in datasets_df.columns:
-                    format_counts = datasets_df['format'].value_counts()
-                    format_df = format_counts.reset_index()
-                    format_df.columns = ['format', 'count']
-                    fig = px.pie(
-                        format_df,
-                        values='count',
-                        names='format',
-                        title="Format Distribution"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("Format data not available")
+                source_df = {
+                    'source': list(counts["source"]),
+                    'count': list(counts["source"].values())
+                }
+                fig = cached_figure(
+                    "pie",
+                    source_df,
+                    values='count',
+                    names='source',
+                    title="Source Distribution"
+                )
+                st.plotly_chart(fig, use_container_width=True)
             
             st.divider()
             
-            with st.expander("📋 View All Datasets"):
-                st.dataframe(datasets_df, use_container_width=True)
+            with st.expander("📋 View Counts"):
+                st.dataframe(category_df, use_container_width=True)
+                st.dataframe(source_df, use_container_width=True)
     
     except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
\ No newline at end of file
+        st.error(f"Error loading data: {str(e)}")
+
+# Figure cache effectiveness: every hit is a chart shown without calling plotly
+with st.sidebar:
+    figure_stats = figure_cache_stats()
+    lookups = figure_stats["hits"] + figure_stats["misses"]
+    st.caption(f"Figure cache: {figure_stats['hit_ratio']:.0%} hits "
+               f"({figure_stats['hits']}/{lookups}), {figure_stats['entries']} figures")
@@ -1,27 +1,37 @@
 import sys
 import os
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-import plotly.express as px
 
 # Ensure the project root is on sys.path
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from app.data.incidents import get_all_incidents, insert_incident
-
 # Page guard
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
+from app.ui.auth import restore_session, logout
 
-if not st.session_state.logged_in:
+if not restore_session():
     st.error("You must be logged in to view this page")
     if st.button("Go to login"):
         st.switch_page("Home.py")
     st.stop()
 
+# Imported after the guard so a logged-out visit doesn't load pandas/plotly
+from datetime import datetime
+import time
+from app.data.aggregates import get_incident_counts
+from app.data.incidents import (
+    get_incidents_page,
+    get_incident_by_id,
+    get_incident_options,
+    insert_incident,
+    search_incidents,
+)
+from app.data.pagination import get_distinct_values
+from app.ui.pager import paged_dataframe
+from app.ui.snapshot import RerunSnapshot
+from app.ui.picker import record_picker
+
 st.set_page_config(
     page_title="Cybersecurity",
     layout="wide"
@@ -34,9 +44,7 @@ with col1:
         st.switch_page("pages/1_Dashboard.py")
 with col2:
     if st.button("Logout →", key="cyber_logout"):
-        st.session_state.logged_in = False
-        st.session_state.username = ""
-        st.session_state.role = "user"
+        logout()
         st.switch_page("Home.py")
 
 def show_create_form():
@@ -44,19 +52,12 @@ def show_create_form():
     st.subheader("Create New Incident")
     
     with st.form("create_form"):
-        col1, col2, col3 = st.columns(3)
+        col1, col2 = st.columns(2)
         
         with col1:
             title = st.text_input("Incident Title", placeholder="e.g., Phishing Attack on Finance Dept")
         
         with col2:
-            incident_type = st.selectbox(
-                "Incident Type",
-                ["Phishing", "SQL injection", "DDoS", "Malware", 
-                 "Social Engineering", "Unauthorized Access", "Data Breach", "Other"]
-            )
-        
-        with col3:
             severity = st.selectbox(
                 "Severity",
                 ["Low", "Medium", "High", "Critical"]
@@ -79,96 +80,97 @@ def show_create_form():
             if not title:
                 st.error("Please enter an incident title")
             else:
-                # Create incident data
-                incident_data = {
-                    'title': title,
-                    'type': incident_type,
-                    'severity': severity,
-                    'description': description,
-                    'status': status,
-                    'date': date.strftime('%Y-%m-%d'),
-                    'created_by': st.session_state.username,
-                    'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
                 # Insert into database
                 try:
-                    result = insert_incident(incident_data)
+                    result = insert_incident(
+                        title,
+                        severity,
+                        status,
+                        date.strftime('%Y-%m-%d'),
+                        description=description or None
+                    )
                     st.success(f"✅ Incident created successfully! ID: {result}")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error creating incident: {e}")
 
-def show_read_form():
+def show_read_form(snapshot):
     """View all incidents - READ operation"""
     st.subheader("View All Incidents")
     
-    incidents = get_all_incidents()
+    # Full-text search over titles and descriptions
+    search_text = st.text_input(
+        "🔎 Search incidents",
+        placeholder="e.g. phishing finance",
+        key="incident_search"
+    )
+    if search_text.strip():
+        started = time.perf_counter()
+        hits = search_incidents(search_text, limit=50)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.caption(f"{len(hits)} matches in {elapsed_ms:.1f} ms")
+        if hits.empty:
+            st.warning("No incidents match your search")
+        else:
+            st.dataframe(hits, use_container_width=True, hide_index=True)
+        st.divider()
     
-    if len(incidents) > 0:
-        # Filters
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            severity_filter = st.selectbox(
-                "Filter by Severity",
-                ["All"] + list(incidents['severity'].unique()) if 'severity' in incidents.columns else ["All"],
-                key="read_severity"
-            )
-        
-        with col2:
-            status_filter = st.selectbox(
-                "Filter by Status",
-                ["All"] + list(incidents['status'].unique()) if 'status' in incidents.columns else ["All"],
-                key="read_status"
-            )
-        
-        # Apply filters
-        filtered = incidents.copy()
-        if severity_filter != "All" and 'severity' in filtered.columns:
-            filtered = filtered[filtered['severity'] == severity_filter]
-        if status_filter != "All" and 'status' in filtered.columns:
-            filtered = filtered[filtered['status'] == status_filter]
-        
-        # Display results
-        st.info(f"Showing {len(filtered)} of {len(incidents)} incidents")
+    # Filters
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        severity_filter = st.selectbox(
+            "Filter by Severity",
+            ["All"] + snapshot.get("severities", get_distinct_values, "cyber_incidents", "severity"),
+            key="read_severity"
+        )
+    
+    with col2:
+        status_filter = st.selectbox(
+            "Filter by Status",
+            ["All"] + snapshot.get("statuses", get_distinct_values, "cyber_incidents", "status"),
+            key="read_status"
+        )
+    
+    # Apply filters in SQL
+    filters = {}
+    if severity_filter != "All":
+        filters['severity'] = severity_filter
+    if status_filter != "All":
+        filters['status'] = status_filter
+    
+    # Display one page at a time
+    page = paged_dataframe(
+        "read_incidents",
+        get_incidents_page,
+        filters=filters,
+        columns=['title', 'severity', 'status', 'date']
+    )
+    
+    if not page.empty:
+        # Show detailed view for selected incident
+        st.subheader("Incident Details")
+        incident_id = record_picker("read", "Select Incident to View Details", get_incident_options)
+        incident = (snapshot.get(f"incident {incident_id}", get_incident_by_id, incident_id)
+                    if incident_id is not None else None)
         
-        # Display in a table
-        if not filtered.empty:
-            display_cols = ['id', 'title', 'severity', 'status', 'date']
-            display_cols = [col for col in display_cols if col in filtered.columns]
-            
-            st.dataframe(
-                filtered[display_cols],
-                use_container_width=True,
-                hide_index=True
-            )
-            
-            # Show detailed view for selected incident
-            st.subheader("Incident Details")
-            incident_options = [f"{row['id']}: {row['title']}" for _, row in filtered.iterrows()]
-            selected = st.selectbox("Select Incident to View Details", incident_options, key="read_select")
+        if incident:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**ID:** {incident['id']}")
+                st.write(f"**Title:** {incident['title']}")
+                if 'severity' in incident:
+                    st.write(f"**Severity:** {incident['severity']}")
             
-            if selected:
-                incident_id = int(selected.split(":")[0])
-                incident = filtered[filtered['id'] == incident_id].iloc[0]
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**ID:** {incident['id']}")
-                    st.write(f"**Title:** {incident['title']}")
-                    if 'severity' in incident:
-                        st.write(f"**Severity:** {incident['severity']}")
-                
-                with col2:
-                    if 'status' in incident:
-                        st.write(f"**Status:** {incident['status']}")
-                    if 'date' in incident:
-                        st.write(f"**Date:** {incident['date']}")
-                    if 'description' in incident:
-                        st.write(f"**Description:** {incident['description']}")
-        else:
-            st.warning("No incidents match the selected filters")
+            with col2:
+                if 'status' in incident:
+                    st.write(f"**Status:** {incident['status']}")
+                if 'date' in incident:
+                    st.write(f"**Date:** {incident['date']}")
+                if 'description' in incident:
+                    st.write(f"**Description:** {incident['description']}")
+    elif filters:
+        st.warning("No incidents match the selected filters")
     else:
         st.info("No incidents found in the database")
 
@@ -176,19 +178,15 @@ def show_update_form():
     """Update an existing incident - UPDATE operation"""
     st.subheader("Update Incident")
     
-    incidents = get_all_incidents()
-    
-    if len(incidents) == 0:
+    if not get_incident_options(limit=1):
         st.info("No incidents to update")
         return
     
-    # Get list of incidents
-    incident_options = [f"{row['id']}: {row['title']}" for _, row in incidents.iterrows()]
-    selected = st.selectbox("Select Incident to Update", incident_options, key="update_select")
+    # Search incidents by title or id
+    incident_id = record_picker("update", "Select Incident to Update", get_incident_options)
+    incident = get_incident_by_id(incident_id) if incident_id is not None else None
     
-    if selected:
-        incident_id = int(selected.split(":")[0])
-        incident = incidents[incidents['id'] == incident_id].iloc[0]
+    if incident:
         
         with st.form("update_form"):
             st.write(f"**Current Incident:** {incident['title']}")
@@ -256,18 +254,14 @@ def show_delete_form():
     """Delete an incident - DELETE operation"""
     st.subheader("Delete Incident")
     
-    incidents = get_all_incidents()
-    
-    if len(incidents) == 0:
+    if not get_incident_options(limit=1):
         st.info("No incidents to delete")
         return
     
-    incident_options = [f"{row['id']}: {row['title']}" for _, row in incidents.iterrows()]
-    selected = st.selectbox("Select Incident to Delete", incident_options, key="delete_select")
+    incident_id = record_picker("delete", "Select Incident to Delete", get_incident_options)
+    incident = get_incident_by_id(incident_id) if incident_id is not None else None
     
-    if selected:
-        incident_id = int(selected.split(":")[0])
-        incident = incidents[incidents['id'] == incident_id].iloc[0]
+    if incident:
         
         # Display incident details before deletion
         st.warning("⚠️ You are about to delete the following incident:")
@@ -301,35 +295,34 @@ def main():
     st.write("View and manage security incidents")
     st.divider()
     
+    # One load of each dataset per rerun, shared by every section
+    snapshot = RerunSnapshot("cyber")
+    
     # Show all incidents
-    show_read_form()
+    show_read_form(snapshot)
     
     st.divider()
     
-    # Display statistics
-    incidents = get_all_incidents()
-    if len(incidents) > 0:
+    # Display statistics (counted in SQL from the incident rollup)
+    counts = snapshot.get("incident_counts", get_incident_counts)
+    if counts["total"] > 0:
         st.subheader("📊 Incident Statistics")
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Incidents", len(incidents))
+            st.metric("Total Incidents", counts["total"])
         
         with col2:
-            if 'severity' in incidents.columns:
-                critical_count = len(incidents[incidents['severity'] == 'Critical'])
-                st.metric("🔴 Critical", critical_count)
+            st.metric("🔴 Critical", counts["severity"].get("critical", 0))
         
         with col3:
-            if 'status' in incidents.columns:
-                open_count = len(incidents[incidents['status'] == 'Open'])
-                st.metric("🟡 Open", open_count)
+            st.metric("🟡 Open", counts["status"].get("open", 0))
         
         with col4:
-            if 'status' in incidents.columns:
-                resolved_count = len(incidents[incidents['status'] == 'Resolved'])
-                st.metric("✅ Resolved", resolved_count)
+            st.metric("✅ Resolved", counts["status"].get("resolved", 0))
+    
+    snapshot.debug_caption()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
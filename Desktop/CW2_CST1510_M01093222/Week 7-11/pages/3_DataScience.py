@@ -1,26 +1,26 @@
 import sys
 import os
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 # Ensure the project root is on sys.path
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from app.data.datasets import get_all_datasets, get_datasets_by_category
-
 # Page guard
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
+from app.ui.auth import restore_session, logout
 
-if not st.session_state.logged_in:
+if not restore_session():
     st.error("You must be logged in to view this page")
     if st.button("Go to login"):
         st.switch_page("Home.py")
     st.stop()
 
+# Imported after the guard so a logged-out visit doesn't load pandas/plotly
+import plotly.express as px
+from app.data.datasets import get_datasets_page, get_dataset_size_summary, get_largest_datasets
+from app.ui.pager import paged_dataframe
+
 st.set_page_config(
     page_title="Data Science",
     layout="wide"
@@ -33,48 +33,44 @@ with col1:
         st.switch_page("pages/1_Dashboard.py")
 with col2:
     if st.button("Logout →", key="ds_logout"):
-        st.session_state.logged_in = False
-        st.session_state.username = ""
-        st.session_state.role = "user"
+        logout()
         st.switch_page("Home.py")
 
 def main():
     st.title(" Data Science Datasets")
     st.divider()
     
-    datasets = get_all_datasets()
+    summary = get_dataset_size_summary()
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Datasets", len(datasets))
+        st.metric("Total Datasets", summary["count"])
     
     with col2:
-        if 'size' in datasets.columns:
-            total_size = datasets['size'].sum() / (1024 * 1024)  # Convert to MB
+        if summary["has_sizes"]:
+            total_size = summary["total_size"] / (1024 * 1024)  # Convert to MB
             st.metric("Total Size (MB)", f"{total_size:.1f}")
         else:
             st.metric("Total Size", "N/A")
     
     with col3:
-        if len(datasets) > 0 and 'size' in datasets.columns:
-            avg_size = total_size / len(datasets)
+        if summary["count"] > 0 and summary["has_sizes"]:
+            avg_size = summary["avg_size"] / (1024 * 1024)
             st.metric("Avg Size (MB)", f"{avg_size:.1f}")
         else:
             st.metric("Avg Size", "N/A")
     
     st.divider()
     
-    if len(datasets) > 0:
-        st.dataframe(datasets)
+    if summary["count"] > 0:
+        paged_dataframe("datasets", get_datasets_page)
         
         st.divider()
         
-        if 'size' in datasets.columns:
+        if summary["has_sizes"]:
             try:
-                datasets_copy = datasets.copy()
-                datasets_copy['size'] = pd.to_numeric(datasets_copy['size'], errors='coerce')
-                top_datasets = datasets_copy.dropna(subset=['size']).nlargest(10, 'size')
+                top_datasets = get_largest_datasets(10)
                 
                 if len(top_datasets) > 0:
                     fig = px.bar(top_datasets, y='name', x='size', orientation='h', 
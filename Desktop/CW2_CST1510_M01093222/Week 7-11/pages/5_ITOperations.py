@@ -1,26 +1,27 @@
 import sys
 import os
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 # Ensure the project root is on sys.path
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from app.data.tickets import get_all_tickets, get_tickets_by_priority
-
 # Page guard
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
+from app.ui.auth import restore_session, logout
 
-if not st.session_state.logged_in:
+if not restore_session():
     st.error("You must be logged in to view this page")
     if st.button("Go to login"):
         st.switch_page("Home.py")
     st.stop()
 
+# Imported after the guard so a logged-out visit doesn't load pandas/plotly
+import plotly.express as px
+from app.data.tickets import get_tickets_page
+from app.data.aggregates import get_ticket_counts
+from app.ui.pager import paged_dataframe
+
 st.set_page_config(
     page_title="IT Operations",
     layout="wide"
@@ -33,9 +34,7 @@ with col1:
         st.switch_page("pages/1_Dashboard.py")
 with col2:
     if st.button("Logout →"):
-        st.session_state.logged_in = False
-        st.session_state.username = ""
-        st.session_state.role = "user"
+        logout()
         st.switch_page("Home.py")
 def main():
     col1, col2 = st.columns([1, 1])
@@ -44,56 +43,48 @@ def main():
             st.switch_page("pages/1_Dashboard.py")
     with col2:
         if st.button("Logout →", key="it_logout"):
-            st.session_state.logged_in = False
-            st.session_state.username = ""
-            st.session_state.role = "user"
+            logout()
             st.switch_page("Home.py")
     
     st.title(" IT Operations Tickets")
     st.divider()
     
-    tickets = get_all_tickets()
+    counts = get_ticket_counts()
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Tickets", len(tickets))
+        st.metric("Total Tickets", counts["total"])
     
     with col2:
-        if len(tickets) > 0:
-            high_priority = len(tickets[tickets['priority'].str.lower() == 'high'])
-            st.metric("High Priority", high_priority)
-        else:
-            st.metric("High Priority", 0)
+        st.metric("High Priority", counts["priority"].get("high", 0))
     
     with col3:
-        if len(tickets) > 0:
-            open_tickets = len(tickets[tickets['status'].str.lower() == 'open'])
-            st.metric("Open Tickets", open_tickets)
-        else:
-            st.metric("Open Tickets", 0)
+        st.metric("Open Tickets", counts["status"].get("open", 0))
     
     st.divider()
     
-    if len(tickets) > 0:
+    if counts["total"] > 0:
         col1, col2 = st.columns(2)
         
         with col1:
-            if 'priority' in tickets.columns:
-                priority_counts = tickets['priority'].value_counts().reset_index()
-                priority_counts.columns = ['Priority', 'Count']
-                fig = px.bar(priority_counts, x='Priority', y='Count', title='Tickets by Priority')
-                st.plotly_chart(fig, use_container_width=True)
+            priority_counts = {
+                'Priority': list(counts["priority"]),
+                'Count': list(counts["priority"].values())
+            }
+            fig = px.bar(priority_counts, x='Priority', y='Count', title='Tickets by Priority')
+            st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            if 'status' in tickets.columns:
-                status_counts = tickets['status'].value_counts().reset_index()
-                status_counts.columns = ['Status', 'Count']
-                fig = px.pie(status_counts, values='Count', names='Status', title='Tickets by Status')
-                st.plotly_chart(fig, use_container_width=True)
+            status_counts = {
+                'Status': list(counts["status"]),
+                'Count': list(counts["status"].values())
+            }
+            fig = px.pie(status_counts, values='Count', names='Status', title='Tickets by Status')
+            st.plotly_chart(fig, use_container_width=True)
         
         st.divider()
-        st.dataframe(tickets, use_container_width=True)
+        paged_dataframe("tickets", get_tickets_page)
     else:
         st.info("No tickets found")
 
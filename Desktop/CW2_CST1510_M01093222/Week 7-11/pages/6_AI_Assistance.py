@@ -1,31 +1,26 @@
 import streamlit as st
-from openai import OpenAI
-from app.data.db import connect_database
-from app.data.incidents import get_all_incidents
-from app.data.datasets import get_all_datasets
-from app.data.tickets import get_all_tickets
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Page guard - check if logged in
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
+from app.ui.auth import restore_session
 
-if not st.session_state.logged_in:
+if not restore_session():
     st.error("You must be logged in to view this page")
     if st.button("Go to login"):
         st.switch_page("Home.py")
     st.stop()
 
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
 # Get API key
 api_key = os.getenv("OPENAI_API_KEY")
 
-# Initialize client
+# Initialize client (openai is only imported when there is a key to use)
 if api_key:
     try:
+        from openai import OpenAI
         client = OpenAI(api_key=api_key)
         api_available = True
     except:
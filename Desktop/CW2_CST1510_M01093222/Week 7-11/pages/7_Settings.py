@@ -8,15 +8,16 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 # Page guard
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
+from app.ui.auth import restore_session, logout
 
-if not st.session_state.logged_in:
+if not restore_session():
     st.error("You must be logged in to view this page")
     if st.button("Go to login"):
         st.switch_page("Home.py")
     st.stop()
 
+from app.services.user_service import password_cost_report
+
 st.set_page_config(
     page_title="Settings",
     layout="wide"
@@ -29,9 +30,7 @@ with col1:
         st.switch_page("pages/1_Dashboard.py")
 with col2:
     if st.button("Logout →"):
-        st.session_state.logged_in = False
-        st.session_state.username = ""
-        st.session_state.role = "user"
+        logout()
         st.switch_page("Home.py")
 
 def main():
@@ -51,5 +50,23 @@ def main():
         if st.button("Update Profile"):
             st.info("Profile update feature coming soon")
 
+    if st.session_state.get("role") == "admin":
+        # pandas is only needed for the admin cost table
+        import pandas as pd
+
+        st.divider()
+        st.subheader("Password Hashing")
+        report = password_cost_report()
+        st.write(f"**bcrypt cost for new hashes:** {report['target_cost']}")
+        st.dataframe(
+            pd.DataFrame(
+                [("not bcrypt" if cost is None else str(cost), users)
+                 for cost, users in report["costs"].items()],
+                columns=["cost", "users"]
+            ),
+            hide_index=True
+        )
+        st.caption(f"{report['below_target']} users will be re-hashed at their next login.")
+
 if __name__ == "__main__":
     main()
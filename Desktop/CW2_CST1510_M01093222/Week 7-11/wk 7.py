@@ -1,6 +1,7 @@
 # Week 7 Authentication System
 import bcrypt
 import os
+import threading
 
 # Define the file where user data will be stored
 USER_DATA_FILE = "users.txt"
@@ -46,6 +47,118 @@ def verify_password(plain_text_password, hashed_password):
     # Comparison
     return bcrypt.checkpw(password_bytes, hashed_password_bytes)
 
+class UserStore:
+    """
+    users.txt with an in-memory index of username -> password hash.
+    
+    The file is read once; after that only the bytes appended since the
+    last read are parsed (the store remembers its file offset), so a
+    lookup is a dict access instead of a scan of every line. New users
+    are appended with a single O_APPEND write, so concurrent writers never
+    interleave lines. If the file shrinks or is replaced it is re-read
+    from the start. A last line without a newline (e.g. after a hand edit)
+    is indexed once the file has stopped growing.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._index = {}
+        self._offset = 0
+        self._inode = None
+        self._ends_with_newline = True
+        self._lock = threading.Lock()
+    
+    def _read_new_lines(self):
+        """Parse complete lines appended since the last read. Caller holds the lock."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._index, self._offset, self._inode = {}, 0, None
+            return
+        
+        # Replaced or truncated: start over
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._index, self._offset, self._inode = {}, 0, stat.st_ino
+            self._ends_with_newline = True
+        if stat.st_size == self._offset:
+            return
+        
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+            size = os.fstat(f.fileno()).st_size
+        
+        # A line still being written has no newline yet; leave it for next
+        # time. If the file has not grown while we read it, the fragment is
+        # a complete last line that just lacks its newline.
+        end = data.rfind(b"\n") + 1
+        if end < len(data) and size == self._offset + len(data):
+            end = len(data)
+        if end:
+            self._ends_with_newline = data[end - 1:end] == b"\n"
+        index = self._index
+        for line in data[:end].decode('utf-8').splitlines():
+            # Format: username,hash (anything after a further comma is ignored)
+            username, sep, rest = line.strip().partition(',')
+            # First entry wins, as with the old line-by-line scan
+            if sep and username and username not in index:
+                index[username] = rest.split(',', 1)[0]
+        self._offset += end
+    
+    def refresh(self):
+        """Pick up users appended by other processes (one stat() if there are none)."""
+        with self._lock:
+            self._read_new_lines()
+    
+    def get_hash(self, username):
+        """Return the stored hash for `username`, or None."""
+        with self._lock:
+            self._read_new_lines()
+            return self._index.get(username)
+    
+    def exists(self, username):
+        return self.get_hash(username) is not None
+    
+    def add(self, username, hashed_password):
+        """
+        Append a user; returns False if the username is already taken.
+        """
+        line = f"{username},{hashed_password}\n".encode('utf-8')
+        with self._lock:
+            self._read_new_lines()
+            if username in self._index:
+                return False
+            if not self._ends_with_newline:
+                # Don't run on from a last line that has no newline
+                line = b"\n" + line
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            # The next read re-parses this line from the old offset, which is harmless
+            self._index[username] = hashed_password
+            return True
+    
+    def __len__(self):
+        with self._lock:
+            self._read_new_lines()
+            return len(self._index)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_user_store(path=None):
+    """
+    Returns the shared UserStore for `path` (default: USER_DATA_FILE).
+    """
+    path = os.path.abspath(path or USER_DATA_FILE)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = UserStore(path)
+        return _stores[path]
+
 def user_exists(username):
     """
     Checks if a username already exists in the user database.
@@ -56,22 +169,7 @@ def user_exists(username):
     Returns:
         bool: True if the user exists, False otherwise
     """
-    # Handle the case where the file doesn't exist yet
-    if not os.path.exists(USER_DATA_FILE):
-        return False
-    
-    # Read the file and check each line for the username
-    try:
-        with open(USER_DATA_FILE, 'r') as f:
-            for line in f.readlines():
-                # Split the line into username and hash
-                stored_username = line.strip().split(',')[0]
-                if stored_username == username:
-                    return True
-    except FileNotFoundError:
-        return False
-    
-    return False
+    return get_user_store().exists(username)
 
 def register_user(username, password):
     """
@@ -94,8 +192,9 @@ def register_user(username, password):
     
     # Append the new user to the file
     # Format: username,hashed_password
-    with open(USER_DATA_FILE, 'a') as f:
-        f.write(f"{username},{hashed_password}\n")
+    if not get_user_store().add(username, hashed_password):
+        print(f"Error: Username '{username}' already exists.")
+        return False
     
     print(f"Success: User '{username}' registered successfully!")
     return True
@@ -116,32 +215,22 @@ def login_user(username, password):
         print("Error: No users registered yet.")
         return False
     
-    # Search for the username in the file
+    # Look the username up in the index
     try:
-        with open(USER_DATA_FILE, 'r') as f:
-            for line in f.readlines():
-                # Split the line, handling potential commas in the hash
-                parts = line.strip().split(',', 1)  # Split only on first comma
-                if len(parts) == 2:
-                    stored_username, stored_hash = parts
-                    
-                    # If username matches, verify the password
-                    if stored_username == username:
-                        if verify_password(password, stored_hash):
-                            print(f"Success: Welcome, {username}!")
-                            return True
-                        else:
-                            print("Error: Invalid password.")
-                            return False
-    except FileNotFoundError:
-        print("Error: User database not found.")
-        return False
+        stored_hash = get_user_store().get_hash(username)
     except Exception as e:
         print(f"Error reading user database: {e}")
         return False
     
-    # If we reach here, the username was not found
-    print("Error: Username not found.")
+    if stored_hash is None:
+        print("Error: Username not found.")
+        return False
+    
+    if verify_password(password, stored_hash):
+        print(f"Success: Welcome, {username}!")
+        return True
+    
+    print("Error: Invalid password.")
     return False
 
 def validate_username(username):